@@ -1,9 +1,11 @@
 from __future__ import annotations
-import uvicorn, os
+import asyncio, uvicorn, os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
 from .routers import documents
+from .static_cache import PDF_CACHE, PrecompressedStaticFiles
 
 app = FastAPI(title="ReadingCopilot Web API", version="0.1.0")
 app.add_middleware(
@@ -13,26 +15,53 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# JSON bodies (document lists, highlights) compress well; PDFs are already deflated.
+app.add_middleware(GZipMiddleware, minimum_size=1024,
+                   exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + ('application/pdf',))
 app.include_router(documents.router)
 
-# Serve uploaded PDFs statically so frontend pdf.js can fetch them
+# Serve uploaded PDFs so frontend pdf.js can fetch them
 import os as _os
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
 _PDF_DIR = _os.path.join('backend','storage','pdfs')
 _os.makedirs(_PDF_DIR, exist_ok=True)
-app.mount('/pdfs', StaticFiles(directory=_PDF_DIR), name='pdfs')
+
+@app.api_route('/pdfs/{name}', methods=['GET', 'HEAD'])
+async def serve_pdf(name: str, request: Request):
+    # FileResponse with a precomputed stat_result takes Starlette's sendfile path
+    # (no user-space copy) and handles Range requests from pdf.js.
+    if name in ('.', '..') or _os.path.basename(name) != name:
+        raise HTTPException(status_code=404, detail='Not Found')
+    path = _os.path.join(_PDF_DIR, name)
+    try:
+        st = _os.stat(path)
+    except OSError:
+        raise HTTPException(status_code=404, detail='Not Found')
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers={'ETag': etag})
+    if 'range' not in request.headers:
+        # Hot PDFs are answered from the in-memory cache; Range requests and
+        # oversized files fall through to sendfile. A miss reads the whole file,
+        # so the lookup runs off the event loop.
+        try:
+            data = await asyncio.to_thread(PDF_CACHE.get_bytes, path, st)
+        except OSError:
+            data = None
+        if data is not None:
+            return Response(content=data, media_type='application/pdf', headers={'ETag': etag, 'Accept-Ranges': 'bytes'})
+    return FileResponse(path, media_type='application/pdf', stat_result=st, headers={'ETag': etag})
 
 # Optionally serve built frontend (Vite build copied to backend/app/static by Dockerfile).
 _STATIC_DIR = _os.path.join(_os.path.dirname(__file__), 'static')
 if _os.path.isdir(_STATIC_DIR):
-    app.mount('/', StaticFiles(directory=_STATIC_DIR, html=True), name='frontend')
+    app.mount('/', PrecompressedStaticFiles(directory=_STATIC_DIR, html=True), name='frontend')
 
     # Fallback route for SPA (only if static present)
-    from fastapi import Request
-    from fastapi.responses import FileResponse
     @app.get('/{full_path:path}')
     async def spa_fallback(full_path: str, request: Request):  # noqa: D401
         if full_path.startswith('api/') or full_path.startswith('pdfs/'):
-            from fastapi import HTTPException
             raise HTTPException(status_code=404, detail='Not Found')
         index_path = _os.path.join(_STATIC_DIR, 'index.html')
         if _os.path.exists(index_path):
@@ -44,4 +73,14 @@ async def root():
     return {"service":"readingcopilot", "status":"ok"}
 
 if __name__ == '__main__':
-    uvicorn.run("backend.app.main:app", host="0.0.0.0", port=int(os.environ.get('PORT', 8000)), reload=True)
+    _port = int(os.environ.get('PORT', 8000))
+    if os.environ.get('RC_DEV'):
+        uvicorn.run("backend.app.main:app", host="0.0.0.0", port=_port, reload=True)
+    else:
+        # loop/http 'auto' pick uvloop + httptools when installed (uvicorn[standard]).
+        # Always one worker: the document store and auto-highlight run registry are
+        # in-process, and workers would overwrite each other's storage snapshots.
+        if int(os.environ.get('WEB_CONCURRENCY', '1')) > 1:
+            raise SystemExit('WEB_CONCURRENCY > 1 is not supported: the document store is single-process')
+        uvicorn.run("backend.app.main:app", host="0.0.0.0", port=_port,
+                    workers=1, loop='auto', http='auto', proxy_headers=True)
@@ -1,22 +1,26 @@
 from __future__ import annotations
 from typing import List, Optional, Tuple
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 import uuid
 
 # Reuse shapes close to desktop version for parity
 class Rect(BaseModel):
+    model_config = ConfigDict(frozen=True)  # shared between published document versions (DocStore.mutate)
+
     x1: float
     y1: float
     x2: float
     y2: float
 
     def normalize(self) -> 'Rect':
-        x1, x2 = sorted([self.x1, self.x2])
-        y1, y2 = sorted([self.y1, self.y2])
-        return Rect(x1=x1, y1=y1, x2=x2, y2=y2)
+        # Fields are already validated floats; min/max avoids a list + sort per axis
+        x1, x2, y1, y2 = self.x1, self.x2, self.y1, self.y2
+        return Rect.model_construct(x1=min(x1, x2), y1=min(y1, y2), x2=max(x1, x2), y2=max(y1, y2))
 
 class Highlight(BaseModel):
+    model_config = ConfigDict(frozen=True)  # shared between published document versions (DocStore.mutate)
+
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     page_index: int
     rects: List[Rect]
@@ -38,6 +42,19 @@ class AnnotationDocument(BaseModel):
     highlight_density_target: float = 0.10
     version: int = 1
 
+class DocumentSummary(BaseModel):
+    id: str
+    filename: str
+    version: int
+    highlight_count: int
+
+class DocumentDelta(BaseModel):
+    id: str
+    version: int
+    highlight_count: int
+    full: bool  # True when `highlights` is the complete list rather than the appended tail
+    highlights: List[Highlight]
+
 class UploadResponse(BaseModel):
     document_id: str
     filename: str
@@ -1,9 +1,11 @@
 from __future__ import annotations
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import JSONResponse, Response
 from fastapi import Depends
-from typing import List
-import os, shutil
-from ..models import AnnotationDocument, UploadResponse, ProfileUpdate, ManualHighlightIn, Highlight, Rect
+from typing import List, Optional
+import os, re, asyncio
+from functools import lru_cache
+from ..models import AnnotationDocument, DocumentDelta, DocumentSummary, UploadResponse, ProfileUpdate, ManualHighlightIn, Highlight, Rect
 from ..storage import STORE
 from ..services import llm_service
 
@@ -11,57 +13,95 @@ router = APIRouter(prefix="/api/docs", tags=["documents"])
 
 PDF_DIR = os.path.join('backend','storage','pdfs')
 os.makedirs(PDF_DIR, exist_ok=True)
+_UPLOAD_CHUNK = 1 << 20  # 1 MiB per read; bounds memory per upload
 
-@router.get('/', response_model=List[AnnotationDocument])
+_FIELD_GROUPS = {
+    'highlights': {'highlights'},
+    'profile': {'global_profile', 'document_goal', 'highlight_density_target'},
+}
+_BASE_FIELDS = {'id', 'filename', 'pdf_path', 'version'}
+
+# List routes return pre-serialized bytes; skips per-request validation/encoding of every document.
+@router.get('/', response_model=List[DocumentSummary])
 def list_documents():
-    return STORE.list()
+    return Response(content=STORE.summaries_json(), media_type='application/json')
+
+@router.get('/full', response_model=List[AnnotationDocument])
+def list_full_documents():
+    return Response(content=STORE.list_json(), media_type='application/json')
 
 @router.post('/', response_model=UploadResponse)
-def upload_pdf(file: UploadFile = File(...)):
+async def upload_pdf(file: UploadFile = File(...)):
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail='Only PDF files allowed')
     dest_path = os.path.join(PDF_DIR, file.filename)
-    with open(dest_path, 'wb') as out:
-        shutil.copyfileobj(file.file, out)
+    # Stream in fixed-size chunks; disk writes go to a worker thread so the event loop stays free
+    out = await asyncio.to_thread(open, dest_path, 'wb')
+    try:
+        while chunk := await file.read(_UPLOAD_CHUNK):
+            await asyncio.to_thread(out.write, chunk)
+    finally:
+        await asyncio.to_thread(out.close)
     doc = AnnotationDocument(filename=file.filename, pdf_path=dest_path)
-    STORE.add_document(doc)
+    await asyncio.to_thread(STORE.add_document, doc)
     return UploadResponse(document_id=doc.id, filename=file.filename)
 
 @router.get('/{doc_id}', response_model=AnnotationDocument)
-def get_document(doc_id: str):
+def get_document(doc_id: str, fields: Optional[str] = None):
+    """Full document by default.
+
+    ?fields=highlights,profile  restrict the payload to those groups (plus id/filename/pdf_path/version)
+    """
     doc = STORE.get(doc_id)
     if not doc:
         raise HTTPException(status_code=404, detail='Not found')
-    return doc
+    if fields:
+        include = set(_BASE_FIELDS)
+        for name in fields.split(','):
+            group = _FIELD_GROUPS.get(name.strip())
+            if group is None:
+                raise HTTPException(status_code=400, detail=f'Unknown field group: {name.strip()}')
+            include |= group
+        return JSONResponse(doc.model_dump(mode='json', include=include))
+    return Response(content=STORE.get_json(doc_id), media_type='application/json')
 
 @router.put('/{doc_id}/profile', response_model=AnnotationDocument)
 def update_profile(doc_id: str, payload: ProfileUpdate):
-    doc = STORE.get(doc_id)
+    def apply(doc: AnnotationDocument):
+        doc.global_profile = payload.global_profile
+        doc.document_goal = payload.document_goal
+        doc.highlight_density_target = max(0.01, min(0.5, payload.highlight_density_target))
+    doc = STORE.mutate(doc_id, apply)
     if not doc:
         raise HTTPException(status_code=404, detail='Not found')
-    doc.global_profile = payload.global_profile
-    doc.document_goal = payload.document_goal
-    doc.highlight_density_target = max(0.01, min(0.5, payload.highlight_density_target))
-    STORE.update(doc)
     return doc
 
-@router.post('/{doc_id}/highlights', response_model=AnnotationDocument)
-def add_highlight(doc_id: str, hl_in: ManualHighlightIn):
+@router.get('/{doc_id}/highlights', response_model=DocumentDelta)
+def get_highlights(doc_id: str, since_version: int = 0):
+    """Highlights appended after `since_version`.
+
+    `full` is true when the server could not diff (highlights removed, unknown version)
+    and `highlights` is the complete list instead.
+    """
     doc = STORE.get(doc_id)
     if not doc:
         raise HTTPException(status_code=404, detail='Not found')
+    hls, full = STORE.highlights_since(doc, since_version)
+    return DocumentDelta(id=doc.id, version=doc.version, highlight_count=len(doc.highlights), full=full, highlights=hls)
+
+@router.post('/{doc_id}/highlights', response_model=AnnotationDocument)
+def add_highlight(doc_id: str, hl_in: ManualHighlightIn):
     hl = Highlight(page_index=hl_in.page_index, rects=[r for r in hl_in.rects], note=hl_in.note)
-    doc.highlights.append(hl)
-    STORE.update(doc)
+    doc = STORE.append_highlights(doc_id, [hl])
+    if not doc:
+        raise HTTPException(status_code=404, detail='Not found')
     return doc
 
 @router.delete('/{doc_id}/highlights')
 def clear_highlights(doc_id: str):
-    doc = STORE.get(doc_id)
+    doc = STORE.mutate(doc_id, lambda d: d.highlights.clear())
     if not doc:
         raise HTTPException(status_code=404, detail='Not found')
-    doc.highlights = []
-    STORE.update(doc)
     return {"status":"cleared"}
 
 # --- Auto highlight orchestration ---
@@ -70,7 +110,7 @@ from ..models import AutoHLRequest, AutoHLStatus
 from readingcopilot.core.llm_highlight import DEFAULT_MIN_THRESHOLD
 
 @router.post('/{doc_id}/auto', response_model=AutoHLStatus)
-def start_auto(doc_id: str, req: AutoHLRequest):
+async def start_auto(doc_id: str, req: AutoHLRequest):
     doc = STORE.get(doc_id)
     if not doc:
         raise HTTPException(status_code=404, detail='Not found')
@@ -82,22 +122,21 @@ def start_auto(doc_id: str, req: AutoHLRequest):
     if req.pages:
         page_filter = _parse_page_range(req.pages)
     run = llm_service.start_auto_highlight(doc, density, thr, page_filter)
-    STORE.update(doc)
     return AutoHLStatus(run_id=run.run_id, state=run.state, emitted=run.generated)
 
 @router.get('/{doc_id}/auto/{run_id}', response_model=AutoHLStatus)
-def auto_status(doc_id: str, run_id: str):
+async def auto_status(doc_id: str, run_id: str):
     run = llm_service.get_run(run_id)
     if not run:
         raise HTTPException(status_code=404, detail='Run not found')
     return AutoHLStatus(run_id=run.run_id, state=run.state, emitted=run.generated)
 
 @router.delete('/{doc_id}/auto/{run_id}', response_model=AutoHLStatus)
-def auto_cancel(doc_id: str, run_id: str):
+async def auto_cancel(doc_id: str, run_id: str):
     run = llm_service.get_run(run_id)
     if not run:
         raise HTTPException(status_code=404, detail='Run not found')
-    llm_service.cancel_run(run_id)
+    await asyncio.to_thread(llm_service.cancel_run, run_id)  # flushes pending highlights to the store
     return AutoHLStatus(run_id=run.run_id, state='cancelling', emitted=run.generated)
 
 @router.get('/{doc_id}/auto/{run_id}/highlights', response_model=AnnotationDocument)
@@ -109,21 +148,22 @@ def auto_results(doc_id: str, run_id: str):
 
 # Helper
 
-def _parse_page_range(spec: str) -> set[int]:
+_PAGE_SEG_RE = re.compile(r'\s*(?:([0-9]+)(?:-([0-9]+))?)?\s*(?:,|\Z)')
+
+@lru_cache(maxsize=128)
+def _parse_page_range(spec: str) -> frozenset[int]:
+    """Parse '1-3,7' into zero-based page indices. Cached, hence immutable."""
     pages: set[int] = set()
-    parts = [p.strip() for p in spec.split(',') if p.strip()]
-    for part in parts:
-        if '-' in part:
-            a,b,*rest = part.split('-')
-            if rest or not a.isdigit() or not b.isdigit():
-                raise ValueError(f'Invalid range segment: {part}')
-            start, end = int(a), int(b)
+    pos, n = 0, len(spec)
+    while pos < n:
+        m = _PAGE_SEG_RE.match(spec, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f'Invalid page range segment: {spec[pos:].split(",")[0].strip()}')
+        if m.group(1):
+            start = int(m.group(1))
+            end = int(m.group(2) or start)
             if start > end:
                 start, end = end, start
-            for v in range(start, end+1):
-                pages.add(v-1)
-        else:
-            if not part.isdigit():
-                raise ValueError(f'Invalid page number: {part}')
-            pages.add(int(part)-1)
-    return pages
+            pages.update(range(start - 1, end))
+        pos = m.end()
+    return frozenset(pages)
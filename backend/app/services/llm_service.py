@@ -1,32 +1,60 @@
 from __future__ import annotations
-from typing import List, Dict
-import threading, time
+from typing import Dict
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import os, threading, time
 from readingcopilot.core.llm_client import AzureOpenAIClient
 from readingcopilot.core.llm_highlight import DEFAULT_MIN_THRESHOLD
-from ..models import AnnotationDocument, Highlight
+from ..models import AnnotationDocument, Highlight, Rect
+from ..storage import STORE
 
 # Simple registry of background highlight runs
 
 class HighlightRun:
     def __init__(self, run_id: str, doc: AnnotationDocument):
         self.run_id = run_id
-        self.doc = doc
+        self.doc: AnnotationDocument | None = doc  # released once the run finishes
         self.state = 'running'
-        self.generated: int = 0
-        self.highlights: List[Highlight] = []
+        self.generated: int = 0  # number of highlights this run appended (not necessarily contiguous)
         self.cancel_event = threading.Event()
+        self.future: Future | None = None
+        self.finished_at: float | None = None
+        # Highlights not yet written to the store; flushed in batches (see _maybe_flush)
+        self.pending: list[Highlight] = []
+        self.last_flush = time.monotonic()
+        self.flush_lock = threading.Lock()
 
-_RUNS: Dict[str, HighlightRun] = {}
+# Shared bounded pool; runs beyond RC_AUTO_MAX queue instead of spawning threads
+_EXEC = ThreadPoolExecutor(max_workers=int(os.environ.get('RC_AUTO_MAX', '8')), thread_name_prefix='autohl')
+
+# Finished runs are kept for status polling, then evicted after RC_RUN_TTL_SEC
+# or once more than _MAX_RUNS are retained (oldest first). Running runs are never evicted.
+_RUN_TTL_SEC = float(os.environ.get('RC_RUN_TTL_SEC', '3600'))
+_MAX_RUNS = 256
+
+_FLUSH_INTERVAL = 0.25  # seconds
+_FLUSH_MAX = 16         # highlights
+
+_RUNS: "OrderedDict[str, HighlightRun]" = OrderedDict()
 _RUNS_LOCK = threading.RLock()
 
+def _evict_runs(now: float):
+    with _RUNS_LOCK:
+        finished = [r for r in _RUNS.values() if r.finished_at is not None]
+        excess = len(_RUNS) - _MAX_RUNS
+        for r in finished:
+            if now - r.finished_at > _RUN_TTL_SEC or excess > 0:
+                del _RUNS[r.run_id]
+                excess -= 1
+
 
 def start_auto_highlight(doc: AnnotationDocument, density: float, min_threshold: float, page_filter: set[int] | None):
     run_id = f"run_{int(time.time()*1000)}"
     run = HighlightRun(run_id, doc)
+    _evict_runs(time.time())
     with _RUNS_LOCK:
         _RUNS[run_id] = run
-    thread = threading.Thread(target=_worker, args=(run, density, min_threshold, page_filter), daemon=True)
-    thread.start()
+    run.future = _EXEC.submit(_worker, run, density, min_threshold, page_filter)
     return run
 
 def cancel_run(run_id: str):
@@ -34,21 +62,51 @@ def cancel_run(run_id: str):
         run = _RUNS.get(run_id)
         if run:
             run.cancel_event.set()
+    if run:
+        _flush(run)
     return run is not None
 
 def get_run(run_id: str) -> HighlightRun | None:
     return _RUNS.get(run_id)
 
+def _to_api_highlight(hl) -> Highlight:
+    """Convert a core (desktop) Highlight to the API model without re-validation."""
+    return Highlight.model_construct(
+        id=hl.id, page_index=hl.page_index,
+        rects=[Rect.model_construct(x1=r.x1, y1=r.y1, x2=r.x2, y2=r.y2) for r in hl.rects],
+        color=hl.color, note=hl.note, created_at=hl.created_at, updated_at=hl.updated_at,
+        profile_score=hl.profile_score, extracted_text=hl.extracted_text, auto_generated=hl.auto_generated,
+    )
+
+def _flush(run: HighlightRun):
+    with run.flush_lock:
+        batch, run.pending = run.pending, []
+        run.last_flush = time.monotonic()
+        if batch and run.doc is not None:
+            STORE.append_highlights(run.doc.id, batch)
+
+def _maybe_flush(run: HighlightRun):
+    if len(run.pending) >= _FLUSH_MAX or time.monotonic() - run.last_flush >= _FLUSH_INTERVAL:
+        _flush(run)
+
 def _worker(run: HighlightRun, density: float, min_threshold: float, page_filter: set[int] | None):
     try:
         client = AzureOpenAIClient()
         from readingcopilot.core.llm_highlight import LLMHighlighter
-        highlighter = LLMHighlighter(client)
+        from readingcopilot.core.score_cache import ScoreCache
+        highlighter = LLMHighlighter(client, score_cache=ScoreCache.default())
+        # Skip text already highlighted on the same page (earlier runs); O(1) per candidate
+        seen = {(h.page_index, h.extracted_text) for h in run.doc.highlights}
 
-        def on_highlight(hl: Highlight):
-            run.highlights.append(hl)
+        def on_highlight(core_hl):
+            key = (core_hl.page_index, core_hl.extracted_text)
+            if key in seen:
+                return
+            seen.add(key)
+            with run.flush_lock:
+                run.pending.append(_to_api_highlight(core_hl))
             run.generated += 1
-            run.doc.highlights.append(hl)
+            _maybe_flush(run)
 
         def should_stop():
             return run.cancel_event.is_set()
@@ -58,6 +116,7 @@ def _worker(run: HighlightRun, density: float, min_threshold: float, page_filter
             pdf_path=run.doc.pdf_path,
             density_target=density,
             on_highlight=on_highlight,
+            on_batch_start=lambda _page: _flush(run),  # don't hold results across the next LLM call
             should_stop=should_stop,
             min_threshold=min_threshold if min_threshold is not None else DEFAULT_MIN_THRESHOLD,
             page_filter=page_filter
@@ -65,3 +124,7 @@ def _worker(run: HighlightRun, density: float, min_threshold: float, page_filter
         run.state = 'cancelled' if run.cancel_event.is_set() else 'completed'
     except Exception as e:
         run.state = 'error:' + str(e)
+    finally:
+        _flush(run)
+        run.finished_at = time.time()
+        run.doc = None
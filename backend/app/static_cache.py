@@ -0,0 +1,90 @@
+from __future__ import annotations
+import os, threading, mimetypes
+from collections import OrderedDict
+from typing import Tuple
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+# Process-local LRU of hot static files (uploaded PDFs).
+# Entries hold the file bytes and are validated against (st_mtime_ns, st_size)
+# on every lookup, so a re-upload under the same name is picked up immediately.
+# Bytes rather than mmap: uploads truncate the file in place, which would turn a
+# stale mapping into SIGBUS.
+
+_Key = Tuple[int, int]
+
+
+class StaticFileCache:
+    def __init__(self, budget_bytes: int = 256 << 20, max_file_bytes: int = 64 << 20):
+        self.budget_bytes = budget_bytes
+        self.max_file_bytes = min(max_file_bytes, budget_bytes)
+        self._entries: OrderedDict[str, Tuple[_Key, bytes]] = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get_bytes(self, path: str, st: os.stat_result | None = None) -> memoryview | None:
+        """Return a read-only view of the file contents, or None if it should not be cached."""
+        st = st or os.stat(path)
+        if st.st_size > self.max_file_bytes:
+            return None
+        key: _Key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            hit = self._entries.get(path)
+            if hit is not None and hit[0] == key:
+                self._entries.move_to_end(path)
+                return memoryview(hit[1])
+        data = self._load(path, st.st_size)
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._total -= old[0][1]
+            self._entries[path] = (key, data)
+            self._total += st.st_size
+            while self._total > self.budget_bytes and len(self._entries) > 1:
+                _, (old_key, _) = self._entries.popitem(last=False)
+                self._total -= old_key[1]
+        return memoryview(data)
+
+    @staticmethod
+    def _load(path: str, size: int) -> bytes:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) != size:
+            raise OSError(f'{path} changed while reading')
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+
+PDF_CACHE = StaticFileCache(budget_bytes=int(os.environ.get('RC_PDF_CACHE_MB', '256')) << 20)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves build-time `.br` / `.gz` sidecars when the client accepts them.
+
+    The frontend build step writes e.g. `index-abc.js.br` next to `index-abc.js`;
+    serving the sidecar costs nothing per request, unlike runtime compression.
+    """
+    _ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        accepted = request_headers.get('accept-encoding', '')
+        for encoding, suffix in self._ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                side_st = os.stat(str(full_path) + suffix)
+            except OSError:
+                continue
+            media_type = mimetypes.guess_type(str(full_path))[0] or 'application/octet-stream'
+            response = FileResponse(str(full_path) + suffix, status_code=status_code, stat_result=side_st,
+                                    media_type=media_type, headers={'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'})
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+        return super().file_response(full_path, stat_result, scope, status_code)
@@ -1,40 +1,179 @@
 from __future__ import annotations
-import os, json, threading
-from typing import Dict
-from .models import AnnotationDocument
+import os, threading, atexit, logging
+from typing import Callable, Dict, List, Tuple
+import bisect
+from pydantic import TypeAdapter
+from readingcopilot.core import jsonio
+try:
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore
+from .models import AnnotationDocument, DocumentSummary, Highlight
 
+log = logging.getLogger(__name__)
+
+# Guards the WAL file, snapshot and derived caches. Document mutations are
+# serialized per document (DocStore._doc_lock) and published copy-on-write, so
+# readers never lock and never observe a half-applied change.
 _STORAGE_LOCK = threading.RLock()
 
+# Mutations are appended to wal.jsonl (one record per line); a background thread
+# folds them into index.json every SNAPSHOT_INTERVAL seconds or SNAPSHOT_OPS ops.
+SNAPSHOT_INTERVAL = float(os.environ.get('RC_SNAPSHOT_INTERVAL', '5'))
+SNAPSHOT_OPS = int(os.environ.get('RC_SNAPSHOT_OPS', '1000'))
+
+# Serialized by pydantic-core directly to JSON bytes (no intermediate dicts).
+_DOC_ADAPTER = TypeAdapter(AnnotationDocument)
+_SUMMARY_ADAPTER = TypeAdapter(List[DocumentSummary])
+_HIGHLIGHTS_ADAPTER = TypeAdapter(List[Highlight])
+
+# Versions per document that highlights_since() can diff against; older ones get a full resend.
+_HL_MARKS_MAX = 64
+
 class DocStore:
     def __init__(self, base: str = "storage"):
         self.base = base
         os.makedirs(self.base, exist_ok=True)
         self._docs: Dict[str, AnnotationDocument] = {}
+        # doc id -> (version, JSON bytes); unchanged docs are not re-dumped at snapshot time
+        self._serialized: Dict[str, Tuple[int, bytes]] = {}
+        self._list_cache: bytes | None = None
+        self._summary_cache: bytes | None = None
+        # doc id -> [(version, highlight count)] for the last _HL_MARKS_MAX versions since the
+        # last shrink; lets highlights_since() return only appended highlights. Process-local.
+        self._hl_marks: Dict[str, List[Tuple[int, int]]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
         self._load_index()
+        for d in self._docs.values():
+            self._hl_marks[d.id] = [(d.version, len(d.highlights))]
+        self._wal = open(self._wal_path(), 'ab', buffering=1 << 16)
+        # Snapshots rewrite index.json from this process's documents and truncate the shared
+        # WAL, so a second process on the same directory would drop the first one's records.
+        # Held until close(); a second DocStore (e.g. another uvicorn worker) fails fast.
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._wal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._wal.close()
+                raise RuntimeError(f'{self.base} is already in use by another process; '
+                                   'the document store supports a single worker') from None
+        self._pending = 0
+        self._wake = threading.Event()
+        self._closed = False
+        self._snapshotter = threading.Thread(target=self._snapshot_loop, name='docstore-snapshot', daemon=True)
+        self._snapshotter.start()
+        atexit.register(self.close)
 
     def _index_path(self):
         return os.path.join(self.base, 'index.json')
 
+    def _wal_path(self):
+        return os.path.join(self.base, 'wal.jsonl')
+
     def _load_index(self):
         try:
-            with open(self._index_path(), 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(self._index_path(), 'rb') as f:
+                data = jsonio.loads(f.read())
             for d in data:
                 self._docs[d['id']] = AnnotationDocument(**d)
         except Exception:
             pass
+        # Replay mutations newer than the snapshot; unreadable records (e.g. a torn final line) are skipped.
+        try:
+            with open(self._wal_path(), 'rb') as f:
+                for lineno, line in enumerate(f, 1):
+                    try:
+                        self._replay(jsonio.loads(line))
+                    except (ValueError, KeyError, TypeError, AttributeError) as e:  # ValidationError is a ValueError
+                        log.warning('skipping unreadable WAL record %d in %s: %s', lineno, self._wal_path(), e)
+        except OSError:
+            pass
+
+    def _replay(self, rec: dict):
+        # Records the snapshot already contains are skipped: a crash (or failed truncate)
+        # between writing index.json and truncating the WAL leaves them in both.
+        op = rec.get('op')
+        if op == 'put':
+            doc = AnnotationDocument(**rec['doc'])
+            current = self._docs.get(doc.id)
+            if current is None or doc.version > current.version:
+                self._docs[doc.id] = doc
+        elif op == 'append_highlights':
+            doc = self._docs.get(rec['doc_id'])
+            version = rec['version']
+            if doc is not None and version > doc.version:
+                items = [Highlight(**h) for h in rec['items']]  # validate the whole record before applying it
+                doc.highlights.extend(items)
+                doc.version = version
+
+    def _dump(self, doc: AnnotationDocument) -> bytes:
+        cached = self._serialized.get(doc.id)
+        if cached is not None and cached[0] == doc.version:
+            return cached[1]
+        data = _DOC_ADAPTER.dump_json(doc)
+        self._serialized[doc.id] = (doc.version, data)
+        return data
+
+    def _doc_lock(self, doc_id: str) -> threading.Lock:
+        lock = self._locks.get(doc_id)
+        if lock is None:
+            with self._locks_lock:
+                lock = self._locks.setdefault(doc_id, threading.Lock())
+        return lock
+
+    def _publish(self, doc: AnnotationDocument, record: bytes | None = None):
+        """Make `doc` the current version and log it. Caller holds the doc lock.
+
+        `record` is a WAL line describing the change; defaults to a full 'put'.
+        """
+        if record is None:
+            record = b'{"op":"put","doc":' + self._dump(doc) + b'}\n'  # serialize outside the store-wide lock
+        with _STORAGE_LOCK:
+            self._docs[doc.id] = doc
+            self._invalidate(doc)
+            self._append(record)
+
+    def _append(self, record: bytes):
+        self._wal.write(record)
+        self._wal.flush()
+        self._pending += 1
+        if self._pending >= SNAPSHOT_OPS:
+            self._wake.set()
 
     def _persist_index(self):
+        """Write a full snapshot atomically and truncate the WAL. Caller holds the lock."""
         try:
-            with open(self._index_path(), 'w', encoding='utf-8') as f:
-                json.dump([d.model_dump() for d in self._docs.values()], f, indent=2)
+            tmp = self._index_path() + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(b'[' + b','.join(self._dump(d) for d in self._docs.values()) + b']')
+            os.replace(tmp, self._index_path())
+            self._wal.truncate(0)
+            self._pending = 0
         except Exception:
             pass
 
-    def add_document(self, doc: AnnotationDocument):
+    def _snapshot_loop(self):
+        while not self._closed:
+            self._wake.wait(SNAPSHOT_INTERVAL)
+            self._wake.clear()
+            with _STORAGE_LOCK:
+                if self._pending and not self._closed:
+                    self._persist_index()
+
+    def close(self):
         with _STORAGE_LOCK:
-            self._docs[doc.id] = doc
-            self._persist_index()
+            if self._closed:
+                return
+            if self._pending:
+                self._persist_index()
+            self._closed = True
+            self._wal.close()
+        self._wake.set()
+
+    def add_document(self, doc: AnnotationDocument):
+        with self._doc_lock(doc.id):
+            self._publish(doc)
 
     def get(self, doc_id: str) -> AnnotationDocument | None:
         return self._docs.get(doc_id)
@@ -42,9 +181,82 @@ class DocStore:
     def list(self):
         return list(self._docs.values())
 
-    def update(self, doc: AnnotationDocument):
+    def _invalidate(self, doc: AnnotationDocument):
+        self._list_cache = None
+        self._summary_cache = None
+        marks = self._hl_marks.setdefault(doc.id, [])
+        count = len(doc.highlights)
+        if marks and count < marks[-1][1]:
+            marks.clear()  # highlights were removed; older versions can't be diffed
+        marks.append((doc.version, count))
+        if len(marks) > _HL_MARKS_MAX:
+            del marks[:-_HL_MARKS_MAX]
+
+    def get_json(self, doc_id: str) -> bytes | None:
         with _STORAGE_LOCK:
-            self._docs[doc.id] = doc
-            self._persist_index()
+            doc = self._docs.get(doc_id)
+            return self._dump(doc) if doc is not None else None
+
+    def highlights_since(self, doc: AnnotationDocument, version: int) -> Tuple[List[Highlight], bool]:
+        """Highlights appended after `version`, plus whether the list is a full resend."""
+        with _STORAGE_LOCK:
+            if version >= doc.version:
+                return [], False
+            marks = self._hl_marks.get(doc.id, [])
+            i = bisect.bisect_left(marks, (version, -1))
+            if i < len(marks) and marks[i][0] == version:
+                return doc.highlights[marks[i][1]:], False
+            return list(doc.highlights), True
+
+    def summaries_json(self) -> bytes:
+        """JSON array of DocumentSummary; rebuilt only after a mutation."""
+        cached = self._summary_cache
+        if cached is not None:
+            return cached
+        with _STORAGE_LOCK:
+            if self._summary_cache is None:
+                self._summary_cache = _SUMMARY_ADAPTER.dump_json([
+                    DocumentSummary(id=d.id, filename=d.filename, version=d.version, highlight_count=len(d.highlights))
+                    for d in self._docs.values()
+                ])
+            return self._summary_cache
+
+    def list_json(self) -> bytes:
+        """JSON array of all documents; rebuilt only after a mutation."""
+        cached = self._list_cache
+        if cached is not None:
+            return cached
+        with _STORAGE_LOCK:
+            if self._list_cache is None:
+                self._list_cache = b'[' + b','.join(self._dump(d) for d in self._docs.values()) + b']'
+            return self._list_cache
+
+    def mutate(self, doc_id: str, fn: Callable[[AnnotationDocument], None], _record=None) -> AnnotationDocument | None:
+        """Apply `fn` to a private copy of the current version and publish it.
+
+        `fn` may assign fields and add, remove or replace entries of `highlights` (the
+        list is copied). Everything else is shared with the published version, which
+        readers may hold, so existing Highlight objects must not be changed in place;
+        Highlight and Rect are frozen models, so assigning their fields raises.
+        Returns the new version, or None if the document does not exist.
+        """
+        with self._doc_lock(doc_id):
+            current = self._docs.get(doc_id)
+            if current is None:
+                return None
+            new = current.model_copy(update={'highlights': list(current.highlights), 'version': current.version + 1})
+            fn(new)
+            self._publish(new, _record(new) if _record else None)
+            return new
+
+    def append_highlights(self, doc_id: str, highlights: List[Highlight]) -> AnnotationDocument | None:
+        """Append highlights as one version; logged as a compact record of just the new items."""
+        if not highlights:
+            return self._docs.get(doc_id)
+        items = _HIGHLIGHTS_ADAPTER.dump_json(highlights)
+        def record(new: AnnotationDocument) -> bytes:
+            head = jsonio.dumps({'op': 'append_highlights', 'doc_id': doc_id, 'version': new.version})
+            return head[:-1] + b',"items":' + items + b'}\n'
+        return self.mutate(doc_id, lambda d: d.highlights.extend(highlights), _record=record)
 
 STORE = DocStore()
@@ -1,6 +1,6 @@
 import React, { useCallback, useEffect, useRef, useState } from 'react';
 import { createRoot } from 'react-dom/client';
-import { listDocuments, uploadPDF, getDocument, addHighlight, updateProfile, clearHighlights, startAuto, pollAuto, fetchAutoDoc, cancelAuto, AnnotationDocument, Rect, API_BASE } from './api';
+import { listDocuments, uploadPDF, getDocument, addHighlight, updateProfile, clearHighlights, startAuto, pollAuto, fetchAutoDoc, cancelAuto, AnnotationDocument, DocumentSummary, Rect, API_BASE } from './api';
 import * as pdfjsLib from 'pdfjs-dist';
 import 'pdfjs-dist/build/pdf.worker.mjs';
 
@@ -9,7 +9,7 @@ import 'pdfjs-dist/build/pdf.worker.mjs';
 interface DragRect { x:number; y:number; w:number; h:number; }
 
 const App: React.FC = () => {
-  const [docs,setDocs]=useState<AnnotationDocument[]>([]);
+  const [docs,setDocs]=useState<DocumentSummary[]>([]);
   const [current,setCurrent]=useState<AnnotationDocument|undefined>();
   const [runId,setRunId]=useState<string|undefined>();
   const [autoState,setAutoState]=useState<string>('idle');
@@ -33,8 +33,7 @@ const App: React.FC = () => {
     if(!f) return;
     const res = await uploadPDF(f);
     await refreshDocs();
-    const doc = (await listDocuments()).find(d=>d.id===res.document_id);
-    setCurrent(doc);
+    setCurrent(await getDocument(res.document_id));
   };
 
   const loadPDF = async()=>{
@@ -163,7 +162,7 @@ const App: React.FC = () => {
     <div className='toolbar'>
       <button onClick={()=>fileInputRef.current?.click()}>Upload PDF</button>
       <input ref={fileInputRef} type='file' style={{display:'none'}} onChange={onUpload} />
-      <select value={current?.id||''} onChange={e=>{ const d=docs.find(x=>x.id===e.target.value); setCurrent(d); }}>
+      <select value={current?.id||''} onChange={async e=>{ const id=e.target.value; setCurrent(id ? await getDocument(id) : undefined); }}>
         <option value=''>--Select Document--</option>
         {docs.map(d=> <option key={d.id} value={d.id}>{d.filename}</option>)}
       </select>
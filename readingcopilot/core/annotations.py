@@ -1,8 +1,9 @@
 from __future__ import annotations
-from typing import List, Optional, Tuple, Any
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Tuple, Any
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import datetime
 import json
+import os
 import uuid
 
 # Coordinate system: page-relative, float values in PDF points (72 dpi), rectangle = (x1, y1, x2, y2)
@@ -14,13 +15,13 @@ class Rect(BaseModel):
     y2: float
 
     def normalize(self) -> 'Rect':
-        x1, x2 = sorted([self.x1, self.x2])
-        y1, y2 = sorted([self.y1, self.y2])
-        return Rect(x1=x1, y1=y1, x2=x2, y2=y2)
+        # Fields are already validated floats; min/max avoids a list + sort per axis
+        x1, x2, y1, y2 = self.x1, self.x2, self.y1, self.y2
+        return Rect.model_construct(x1=min(x1, x2), y1=min(y1, y2), x2=max(x1, x2), y2=max(y1, y2))
 
     def to_tuple(self) -> Tuple[float, float, float, float]:
-        r = self.normalize()
-        return r.x1, r.y1, r.x2, r.y2
+        x1, x2, y1, y2 = self.x1, self.x2, self.y1, self.y2
+        return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
 
 class Highlight(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -39,6 +40,10 @@ class Highlight(BaseModel):
         self.note = note
         self.updated_at = datetime.utcnow()
 
+    def display_label(self) -> str:
+        # Built on demand: formatting is cheaper than a pydantic private-attr cache lookup
+        return f"Page {self.page_index+1} - {self.note[:30] if self.note else 'No note'}"
+
 class AnnotationDocument(BaseModel):
     pdf_path: str
     highlights: List[Highlight] = []
@@ -47,15 +52,47 @@ class AnnotationDocument(BaseModel):
     document_goal: Optional[str] = None    # 150-word PDF-specific goal
     highlight_density_target: float = 0.10 # target fraction (0.01 .. 0.5) user preference
     version: int = 1
+    # page_index -> highlights, for page turns; rebuilt whenever `highlights` was
+    # replaced or resized behind our back (keyed by list identity and length)
+    _by_page: Dict[int, List[Highlight]] = PrivateAttr(default_factory=dict)
+    _by_page_key: Optional[Tuple[int, int]] = PrivateAttr(default=None)
 
     def add_highlight(self, highlight: Highlight):
         self.highlights.append(highlight)
+        if self._by_page_key == (id(self.highlights), len(self.highlights) - 1):
+            self._by_page.setdefault(highlight.page_index, []).append(highlight)
+            self._by_page_key = (id(self.highlights), len(self.highlights))
+
+    def add_highlights(self, highlights: List[Highlight]):
+        """Append several highlights at once (one index update for the batch)."""
+        if not highlights:
+            return
+        indexed = self._by_page_key == (id(self.highlights), len(self.highlights))
+        self.highlights.extend(highlights)
+        if indexed:
+            by_page = self._by_page
+            for hl in highlights:
+                by_page.setdefault(hl.page_index, []).append(hl)
+            self._by_page_key = (id(self.highlights), len(self.highlights))
+
+    def highlights_on_page(self, page_index: int) -> List[Highlight]:
+        """Highlights on one page, in document order. Do not mutate the result."""
+        key = (id(self.highlights), len(self.highlights))
+        if self._by_page_key != key:
+            by_page: Dict[int, List[Highlight]] = {}
+            for hl in self.highlights:
+                by_page.setdefault(hl.page_index, []).append(hl)
+            self._by_page = by_page
+            self._by_page_key = key
+        return self._by_page.get(page_index, [])
 
     def clear_highlights(self):
         """Remove all highlights from the document.
 
         Caller is responsible for persisting via save()."""
         self.highlights.clear()
+        self._by_page = {}
+        self._by_page_key = (id(self.highlights), 0)
 
     def to_json(self, **kwargs: Any) -> str:
         return self.model_dump_json(indent=2, **kwargs)
@@ -66,17 +103,56 @@ class AnnotationDocument(BaseModel):
 
     def save(self, path: Optional[str] = None):
         path = path or self._default_annotations_path()
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(self.to_json())
+        write_text_atomic(path, self.to_json())
+        self.discard_journal(path)  # the full file now holds everything the journal did
 
     @classmethod
     def load(cls, pdf_path: str, path: Optional[str] = None) -> 'AnnotationDocument':
         inst_path = path or cls._default_annotations_path_for(pdf_path)
         try:
             with open(inst_path, 'r', encoding='utf-8') as f:
-                return cls.from_json(f.read())
+                doc = cls.from_json(f.read())
+        except FileNotFoundError:
+            doc = AnnotationDocument(pdf_path=pdf_path)
+        doc._replay_journal(_journal_path_for(inst_path))
+        return doc
+
+    # ---- Append-only journal ----
+    # Highlights added in bulk (LLM runs) are appended to <annotations>.jsonl, one JSON
+    # object per line, instead of rewriting the whole annotation file: O(new) per batch.
+    # load() replays the journal on top of the last full save; a full save discards it.
+    def append_to_journal(self, highlights: List[Highlight], path: Optional[str] = None):
+        if not highlights:
+            return
+        data = "".join(hl.model_dump_json() + "\n" for hl in highlights)
+        with open(_journal_path_for(path or self._default_annotations_path()), 'a', encoding='utf-8') as f:
+            f.write(data)
+
+    def discard_journal(self, path: Optional[str] = None):
+        try:
+            os.remove(_journal_path_for(path or self._default_annotations_path()))
+        except FileNotFoundError:
+            pass
+
+    def _replay_journal(self, journal_path: str):
+        try:
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
         except FileNotFoundError:
-            return AnnotationDocument(pdf_path=pdf_path)
+            return
+        # Entries already in the full file (saved after they were journaled) are skipped,
+        # so the full file's copy, with any later note edits, wins
+        known = {hl.id for hl in self.highlights}
+        replayed: List[Highlight] = []
+        for line in lines:
+            try:
+                hl = Highlight.model_validate_json(line)
+            except ValueError:
+                continue  # torn final line from an interrupted append
+            if hl.id not in known:
+                known.add(hl.id)
+                replayed.append(hl)
+        self.add_highlights(replayed)
 
     def _default_annotations_path(self) -> str:
         return self._default_annotations_path_for(self.pdf_path)
@@ -85,6 +161,16 @@ class AnnotationDocument(BaseModel):
     def _default_annotations_path_for(pdf_path: str) -> str:
         return pdf_path + '.annotations.json'
 
+def _journal_path_for(annotations_path: str) -> str:
+    return os.path.splitext(annotations_path)[0] + '.jsonl'
+
+def write_text_atomic(path: str, text: str):
+    """Write via a temp file + rename so readers never see a half-written file."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
 # FUTURE: Positional Text Mapping Strategy
 # 1. Use pdfminer.six or pdfplumber to extract per-character or per-word bounding boxes.
 # 2. For each Highlight.rect, find intersecting words and concatenate in reading order.
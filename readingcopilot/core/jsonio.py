@@ -0,0 +1,43 @@
+"""Thin JSON helpers that use orjson when installed and fall back to stdlib json.
+
+Only the hot paths (LLM response parsing, prompt building, store persistence) go
+through here; orjson is optional and never required for correctness.
+"""
+from __future__ import annotations
+from typing import Any
+import json
+
+try:
+    import orjson  # type: ignore
+    HAVE_ORJSON = True
+except Exception:  # pragma: no cover - environment dependent
+    orjson = None  # type: ignore
+    HAVE_ORJSON = False
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode JSON from str or bytes. Raises ValueError on malformed input."""
+    if HAVE_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode to compact UTF-8 JSON bytes (non-ASCII kept as-is)."""
+    if HAVE_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """Encode to 2-space indented UTF-8 JSON bytes (for human-readable logs)."""
+    if HAVE_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    """Encode to a JSON str (non-ASCII kept as-is)."""
+    if HAVE_ORJSON:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Tuple
+from collections import Counter
+from functools import lru_cache
 import re
 
 # Lightweight heuristic keyword extraction (no external deps)
@@ -9,35 +11,30 @@ import re
 #  3. Count frequency; stable order by first appearance when frequencies tie.
 #  4. Return up to max_keywords tokens (original casing capitalized) preserving ranking.
 
-_STOPWORDS = {
+_STOPWORDS = frozenset({
     'the','and','for','with','that','this','from','are','was','were','will','shall','into','your','have','has','had',
     'but','not','can','could','would','should','a','an','of','on','in','to','as','by','it','its','at','or','be','is',
     'we','our','you','their','there','about','over','any','all','more','most','such','other','than','may','if','also'
-}
+})
 
 _TOKEN_RE = re.compile(r"[A-Za-z0-9']+")
 
 def extract_keywords(text: str, max_keywords: int = 4) -> List[str]:
     if not text:
         return []
+    # Same highlight text recurs across refreshes and documents; callers get a fresh list
+    return list(_extract_keywords_cached(text, max_keywords))
+
+@lru_cache(maxsize=1024)
+def _extract_keywords_cached(text: str, max_keywords: int) -> Tuple[str, ...]:
     tokens = _TOKEN_RE.findall(text)
-    order_index = {}
-    freq = {}
-    for idx, raw in enumerate(tokens):
-        t = raw.lower().strip("'_")
-        if not t or t in _STOPWORDS or len(t) < 3 or t.isdigit():
-            continue
-        if t not in order_index:
-            order_index[t] = idx
-        freq[t] = freq.get(t, 0) + 1
+    # Counter keeps first-appearance order and most_common() is a stable sort,
+    # so frequency ties still rank by first appearance.
+    freq = Counter(t for t in (raw.lower().strip("'_") for raw in tokens)
+                   if len(t) >= 3 and t not in _STOPWORDS and not t.isdigit())
     if not freq:
         # fallback: first few words (cleaned)
-        cleaned = [w.capitalize() for w in tokens[:max_keywords]]
-        return cleaned
-    ranked = sorted(freq.items(), key=lambda kv: (-kv[1], order_index[kv[0]]))
-    out: List[str] = []
-    for w, _ in ranked[:max_keywords]:
-        out.append(w.capitalize())
-    return out
+        return tuple(w.capitalize() for w in tokens[:max_keywords])
+    return tuple(w.capitalize() for w, _ in freq.most_common(max_keywords))
 
 __all__ = ["extract_keywords"]
@@ -1,10 +1,29 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Tuple
 import os
+import re
+import threading
 import requests
+from . import jsonio
+from requests.adapters import HTTPAdapter
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+def _http_session() -> requests.Session:
+    """Process-wide keep-alive session so TCP/TLS setup is paid once, not per batch."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=64)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _SESSION = s
+    return _SESSION
 
 @dataclass
 class ScoredChunk:
@@ -26,8 +45,10 @@ class AzureOpenAIClient(BaseLLMClient):
       RC_AZURE_OPENAI_KEY           (required)
       RC_AZURE_OPENAI_DEPLOYMENT    (deployment name, default gpt-4o-mini)
       RC_AZURE_OPENAI_API_VERSION   (optional api-version, default 2024-05-01-preview)
-      RC_AZURE_OPENAI_MAX_TOKENS    (max completion tokens, default 250)
+      RC_AZURE_OPENAI_MAX_TOKENS    (max completion tokens, default 250; raised to
+                                     TOKENS_PER_ROW per chunk for larger batches)
     """
+    TOKENS_PER_ROW = 60  # id + relevance + <=25-word rationale + phrase
     def __init__(self):
         self.endpoint = os.environ.get("RC_AZURE_OPENAI_ENDPOINT")
         self.key = os.environ.get("RC_AZURE_OPENAI_KEY")
@@ -49,7 +70,7 @@ class AzureOpenAIClient(BaseLLMClient):
             "phrase = ONE short cohesive human-friendly label 1-4 words (no quotes, no trailing punctuation) summarizing the chunk (e.g. AMD Instinct GPUs, Hyperscaler demand signal, Roadmap differentiation). "
             "No commentary before or after JSON."
         )
-        user = json.dumps(payload, ensure_ascii=False)
+        user = jsonio.dumps_str(payload)
         return [
             {"role": "system", "content": system},
             {"role": "user", "content": user},
@@ -63,7 +84,8 @@ class AzureOpenAIClient(BaseLLMClient):
         body = {
             "messages": messages,
             "temperature": 0,
-            "max_tokens": self.max_tokens,
+            # Size the completion budget to the batch so large batches aren't truncated
+            "max_tokens": max(self.max_tokens, self.TOKENS_PER_ROW * len(chunks)),
             "n": 1,
         }
         headers = {
@@ -71,7 +93,7 @@ class AzureOpenAIClient(BaseLLMClient):
             "Content-Type": "application/json",
         }
         try:
-            resp = requests.post(url, headers=headers, json=body, timeout=60)
+            resp = _http_session().post(url, headers=headers, json=body, timeout=60)
         except requests.RequestException as e:
             raise RuntimeError(f"Azure OpenAI network error: {e}")
         if resp.status_code != 200:
@@ -95,13 +117,63 @@ def build_llm_client() -> BaseLLMClient:
     return AzureOpenAIClient()
 
 
+# Structural characters outside / inside a JSON string; the scanner jumps between
+# them with the C regex engine instead of stepping through every character.
+_STRUCT_RE = re.compile(r'[{}"\]]')
+_STRING_RE = re.compile(r'["\\]')
+
+def _scan_objects(work: str) -> List[Tuple[int, int]]:
+    """Return (start, end) offsets of each complete top-level {...} object in work.
+
+    Stops at the first ']' outside a string and outside an object, or at an
+    unterminated string (truncated output), mirroring a char-by-char state machine.
+    """
+    spans: List[Tuple[int, int]] = []
+    depth = 0
+    start = -1
+    i = 0
+    while True:
+        m = _STRUCT_RE.search(work, i)
+        if m is None:
+            return spans
+        j = m.start()
+        ch = work[j]
+        if ch == '"':
+            k = j + 1
+            while True:
+                m2 = _STRING_RE.search(work, k)
+                if m2 is None:
+                    return spans
+                if work[m2.start()] == '\\':
+                    k = m2.start() + 2
+                    continue
+                k = m2.start() + 1
+                break
+            i = k
+            continue
+        if ch == '{':
+            if start < 0:
+                start = j
+                depth = 1
+            else:
+                depth += 1
+        elif ch == '}':
+            if start >= 0:
+                depth -= 1
+                if depth == 0:
+                    spans.append((start, j + 1))
+                    start = -1
+        elif start < 0:  # ']' closing the outer array
+            return spans
+        i = j + 1
+
+
 def parse_scores(raw: str) -> List[ScoredChunk]:
     """Parse a raw JSON (or wrapped) string of scored chunks into ScoredChunk list.
 
     Exposed separately for unit testing robustness of JSON extraction.
     Accepts either a direct JSON list or text containing exactly one JSON list substring.
     """
-    import json as _json
     first = raw.find('[')
     last = raw.rfind(']')
     if first != -1 and last != -1 and last > first:
@@ -109,52 +181,20 @@ def parse_scores(raw: str) -> List[ScoredChunk]:
     else:
         snippet = raw
     try:
-        arr = _json.loads(snippet)
+        arr = jsonio.loads(snippet)
     except Exception as e:
         # Fallback: attempt to recover partial / truncated JSON array produced by model
         # by incrementally extracting completed top-level objects while ignoring the rest.
         # This handles cases where generation stops mid-object due to token limits.
         recovered = []
-        in_string = False
-        escape = False
-        brace_depth = 0
-        collecting = False
-        buf_chars: List[str] = []  # type: ignore
         # Work only on the portion after the first '[' (if any) to reduce noise.
         work = raw[first+1:] if first != -1 else raw
-        for ch in work:
-            if collecting:
-                buf_chars.append(ch)
-            if ch == '"' and not escape:
-                in_string = not in_string
-            if in_string and ch == '\\' and not escape:
-                escape = True
-            else:
-                escape = False
-            if not in_string:
-                if ch == '{':
-                    if not collecting:
-                        collecting = True
-                        buf_chars = ['{']  # restart buffer including this brace
-                        brace_depth = 1
-                        continue
-                    else:
-                        brace_depth += 1
-                elif ch == '}' and collecting:
-                    brace_depth -= 1
-                    if brace_depth == 0:
-                        # Completed one object
-                        obj_text = ''.join(buf_chars)
-                        collecting = False
-                        try:
-                            obj = _json.loads(obj_text)
-                            recovered.append(obj)
-                        except Exception:
-                            # Ignore malformed object
-                            pass
-            # Early exit optimization: if a closing ']' is hit outside a string and not collecting.
-            if ch == ']' and not in_string and not collecting:
-                break
+        for s, t in _scan_objects(work):
+            try:
+                recovered.append(jsonio.loads(work[s:t]))
+            except Exception:
+                # Ignore malformed object
+                pass
         if not recovered:
             raise ValueError(f"Unable to parse scores JSON: {e}")
         arr = recovered
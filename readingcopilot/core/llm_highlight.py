@@ -1,106 +1,170 @@
 from __future__ import annotations
-from typing import List, Tuple, Optional, Set
+from typing import List, Tuple, Optional, Sequence, Set
 from .text_extraction import extract_chunks, TextChunk
 from .llm_client import BaseLLMClient, ScoredChunk
 from .annotations import Highlight, Rect, AnnotationDocument
 from .keywords import extract_keywords
-import os, json
+from .score_cache import ScoreCache
+from . import jsonio
+import os, heapq
+from collections import deque
+from itertools import islice
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
 
 # NOTE: This module now produces a per-run log file summarizing the LLM highlight pipeline.
 # Log location: ~/.readingcopilot/logs/llm_run_<timestamp>.json
-# Sensitive secrets (API keys) are NEVER written.
+# Sensitive secrets (API keys) are NEVER written. Set RC_LOG_LEVEL=off to skip logging.
 
 DEFAULT_MIN_THRESHOLD = 0.60  # Updated default relevance threshold
+DEFAULT_ROWS_PER_CALL = 24  # chunks marshaled into one generate() scoring call; RC_LLM_ROWS_PER_CALL overrides
+DEFAULT_SCORING_CONCURRENCY = 4  # score_chunks calls in flight per run; RC_LLM_CONCURRENCY overrides
+
+def _rows_per_call() -> int:
+    try:
+        return max(1, int(os.environ.get("RC_LLM_ROWS_PER_CALL", DEFAULT_ROWS_PER_CALL)))
+    except ValueError:
+        return DEFAULT_ROWS_PER_CALL
+
+def _scoring_concurrency() -> int:
+    try:
+        return max(1, int(os.environ.get("RC_LLM_CONCURRENCY", DEFAULT_SCORING_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_SCORING_CONCURRENCY
+
+@lru_cache(maxsize=8)
+def _env_min_threshold(raw: str | None) -> float | None:
+    """Parse RC_MIN_RELEVANCE_THRESHOLD; None when unset or outside [0, 1]."""
+    try:
+        mt = float(raw) if raw else None
+    except ValueError:
+        return None
+    return mt if mt is not None and 0.0 <= mt <= 1.0 else None
+
+@lru_cache(maxsize=8)
+def _find_repo_root(start: str) -> str | None:
+    # Memoized per start directory: the walk costs up to 30 stats per run
+    markers = (".git", "README.md", "requirements.txt")
+    path = start
+    for _ in range(10):  # limit climb depth
+        if any(os.path.exists(os.path.join(path, m)) for m in markers):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return None
+
+# (RC_LOG_DIR value, cwd) -> log directory already created by _log_dir()
+_LOG_DIR_CACHE: dict[tuple, str] = {}
+
+AUTO_HIGHLIGHT_COLOR = (255, 170, 90)
+
+@lru_cache(maxsize=4096)
+def _keyword_note(text: str) -> str | None:
+    # Keyed on text rather than chunk id: ids restart at 0 for every PDF.
+    kw = extract_keywords(text, max_keywords=4)
+    return " ".join(kw) if kw else None
+
+def _make_highlight(chunk: TextChunk, relevance: float, scored: ScoredChunk | None) -> Highlight:
+    """Build an auto highlight for a chunk.
+
+    Fields come from our own extraction/scoring, so model_construct skips
+    re-validating every Rect and Highlight on the streaming path.
+    """
+    phrase = getattr(scored, 'phrase', None) if scored else None
+    note = phrase if phrase else _keyword_note(chunk.text)
+    rects = [Rect.model_construct(x1=r[0], y1=r[1], x2=r[2], y2=r[3]) for r in chunk.rects]
+    return Highlight.model_construct(page_index=chunk.page_index, rects=rects, extracted_text=chunk.text,
+                                     auto_generated=True, profile_score=relevance, color=AUTO_HIGHLIGHT_COLOR, note=note)
+
+def _relevances(chunks: Sequence[TextChunk], scored_map: dict) -> List[float]:
+    """Relevance per chunk, aligned with `chunks`; 0.0 for chunks without a score.
+
+    One dict probe per chunk and no placeholder ScoredChunk objects."""
+    get = scored_map.get
+    return [s.relevance if (s := get(c.id)) is not None else 0.0 for c in chunks]
+
+def select_indices(relevances: Sequence[float], word_counts: Sequence[int], min_threshold: float,
+                   target_words: int, soft_cap_multiplier: float = 2.0) -> List[int]:
+    """Pick chunk indices in descending relevance until the word budget's soft cap.
+
+    Pure function over plain numbers (no chunk objects), so it is cheap to test and
+    profile on its own. Chunks below min_threshold are never selected; ties keep
+    chunk order. Uses a heap: O(N) build plus one pop per selected chunk.
+    """
+    heap = [(-rel, idx) for idx, rel in enumerate(relevances)]
+    heapq.heapify(heap)
+    out: List[int] = []
+    accumulated = 0
+    cap = target_words * soft_cap_multiplier
+    while heap:
+        neg_rel, idx = heapq.heappop(heap)
+        if -neg_rel < min_threshold:
+            break  # everything left scores lower still
+        out.append(idx)
+        accumulated += word_counts[idx]
+        if accumulated >= cap:
+            break
+    return out
 
 class LLMHighlighter:
-    def __init__(self, client: BaseLLMClient):
+    def __init__(self, client: BaseLLMClient, score_cache: ScoreCache | None = None):
         self.client = client
+        self.score_cache = score_cache  # optional; chunks with a cached score skip the LLM
         self.last_log_path: str | None = None
 
-    def generate(self, annotation_doc: AnnotationDocument, pdf_path: str, density_target: float, min_threshold: float = DEFAULT_MIN_THRESHOLD, page_filter: Optional[Set[int]] = None):
+    def generate(self, annotation_doc: AnnotationDocument, pdf_path: str, density_target: float, min_threshold: float = DEFAULT_MIN_THRESHOLD, page_filter: Optional[Set[int]] = None,
+                 should_stop=None):  # callable() -> bool, checked between scoring batches
         # Allow environment variable override (RC_MIN_RELEVANCE_THRESHOLD)
         if min_threshold == DEFAULT_MIN_THRESHOLD:  # only override if caller used default
-            env_thr = os.environ.get("RC_MIN_RELEVANCE_THRESHOLD")
-            if env_thr:
-                try:
-                    mt = float(env_thr)
-                    if 0.0 <= mt <= 1.0:
-                        min_threshold = mt
-                except ValueError:
-                    pass
+            env_thr = _env_min_threshold(os.environ.get("RC_MIN_RELEVANCE_THRESHOLD"))
+            if env_thr is not None:
+                min_threshold = env_thr
         # Step 1: Extract chunks
         chunks = extract_chunks(pdf_path)
         if page_filter:
             # keep only chunks whose page_index is in filter
             chunks = [c for c in chunks if c.page_index in page_filter]
         if not chunks:
-            self._write_log(pdf_path, annotation_doc, density_target, [], {}, [], [], reason="no_chunks_extracted")
+            self._write_log(pdf_path, annotation_doc, density_target, [], {}, [], min_threshold, reason="no_chunks_extracted")
             return []
-        # Prepare payload for scoring (batched)
+        # Prepare payload for scoring: many rows per call amortize round-trip and prompt
+        # overhead; up to RC_LLM_CONCURRENCY calls in flight
         scored_map = {}
-        batch_size = 8
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i+batch_size]
-            scored = self.client.score_chunks(
-                chunks=[{"id": c.id, "text": c.text} for c in batch],
-                global_profile=annotation_doc.global_profile or "",
-                document_goal=annotation_doc.document_goal or ""
-            )
+        batch_size = _rows_per_call()
+        cache_ctx = self._cache_context(annotation_doc)
+        scored_map.update(self._cache_lookup(chunks, cache_ctx))
+        to_score = [c for c in chunks if c.id not in scored_map]
+        batches = [to_score[i:i+batch_size] for i in range(0, len(to_score), batch_size)]
+        results = self._score_batches(batches, annotation_doc, should_stop)
+        # On cancel, select from what was scored so far (unscored chunks count as 0)
+        cancelled = len(results) < len(batches)
+        for batch, scored in zip(batches, results):
             for s in scored:
                 scored_map[s.id] = s
+            self._cache_store(batch, scored, cache_ctx)
         # Assign scores; default 0 if missing
-        scored_chunks: List[Tuple[TextChunk, float]] = []
-        total_words = 0
-        for c in chunks:
-            words = len(c.text.split())
-            total_words += words
-            relevance = scored_map.get(c.id, ScoredChunk(id=c.id, relevance=0.0, rationale="missing")).relevance
-            scored_chunks.append((c, relevance))
+        relevances = _relevances(chunks, scored_map)
+        word_counts = [c.word_count for c in chunks]
+        total_words = sum(word_counts)
         if total_words == 0:
-            self._write_log(pdf_path, annotation_doc, density_target, chunks, scored_map, scored_chunks, [], reason="zero_total_words")
+            self._write_log(pdf_path, annotation_doc, density_target, chunks, scored_map, [], min_threshold, reason="zero_total_words")
             return []
         target_words = max(1, int(total_words * density_target))
-        # Sort by relevance
-        scored_chunks.sort(key=lambda x: x[1], reverse=True)
-        selected: List[Highlight] = []
-        accumulated = 0
-        for chunk, rel in scored_chunks:
-            if rel < min_threshold:
-                # If we've already satisfied target words, encountering first below-threshold ends selection
-                if accumulated >= target_words:
-                    break
-                # Otherwise skip and keep scanning for higher relevance
-                continue
-            rects = [Rect(x1=r[0], y1=r[1], x2=r[2], y2=r[3]) for r in chunk.rects]
-            scored = scored_map.get(chunk.id)
-            phrase = getattr(scored, 'phrase', None) if scored else None
-            if phrase:
-                note = phrase
-            else:
-                kw = extract_keywords(chunk.text, max_keywords=4)
-                note = " ".join(kw) if kw else None
-            hl = Highlight(page_index=chunk.page_index, rects=rects, extracted_text=chunk.text, auto_generated=True, profile_score=rel, color=(255, 170, 90), note=note)
-            selected.append(hl)
-            accumulated += len(chunk.text.split())
-            if accumulated >= target_words * 2:  # soft cap
-                break
+        selected: List[Highlight] = [
+            _make_highlight(chunks[i], relevances[i], scored_map.get(chunks[i].id))
+            for i in select_indices(relevances, word_counts, min_threshold, target_words)
+        ]
         # Fallback: if no highlights selected but we have scored chunks, choose the top one (even if below threshold)
         fallback_used = False
-        if not selected and scored_chunks:
-            top_chunk, top_rel = scored_chunks[0]
+        if not selected:
+            top_idx = max(range(len(relevances)), key=relevances.__getitem__)  # first of the maxima
+            top_chunk, top_rel = chunks[top_idx], relevances[top_idx]
             # Only fallback if top chunk actually meets threshold (avoid surfacing low-quality 0.4 scores)
             if top_rel >= min_threshold:
-                rects = [Rect(x1=r[0], y1=r[1], x2=r[2], y2=r[3]) for r in top_chunk.rects]
-                scored_top = scored_map.get(top_chunk.id)
-                phrase = getattr(scored_top, 'phrase', None) if scored_top else None
-                if phrase:
-                    note = phrase
-                else:
-                    kw = extract_keywords(top_chunk.text, max_keywords=4)
-                    note = " ".join(kw) if kw else None
-                selected.append(Highlight(page_index=top_chunk.page_index, rects=rects, extracted_text=top_chunk.text, auto_generated=True, profile_score=top_rel, color=(255, 170, 90), note=note))
+                selected.append(_make_highlight(top_chunk, top_rel, scored_map.get(top_chunk.id)))
                 fallback_used = True
         self._write_log(
             pdf_path,
@@ -108,10 +172,9 @@ class LLMHighlighter:
             density_target,
             chunks,
             scored_map,
-            scored_chunks,
             selected,
             min_threshold,
-            reason=("fallback_top_chunk" if (not selected and scored_chunks) else ("fallback_used" if fallback_used else "ok"))
+            reason=("cancelled" if cancelled else "fallback_top_chunk" if not selected else ("fallback_used" if fallback_used else "ok"))
         )
         return selected
 
@@ -128,7 +191,8 @@ class LLMHighlighter:
 
         Strategy:
           1. Extract all chunks (filtered by page_filter if provided).
-          2. Score in batches with existing client (still synchronous per batch).
+          2. Score in batches, with up to RC_LLM_CONCURRENCY calls in flight; results are
+             consumed in batch order, so emissions match one-at-a-time scoring.
           3. After each batch, merge scores so far, recompute ordered list, and emit any *new* highlights
              whose relevance >= threshold until target budget reached. Avoid re-emitting duplicates.
           4. Stop early if accumulated word budget surpasses soft cap.
@@ -139,35 +203,53 @@ class LLMHighlighter:
         """
         # Env override like non-streaming
         if min_threshold == DEFAULT_MIN_THRESHOLD:
-            env_thr = os.environ.get("RC_MIN_RELEVANCE_THRESHOLD")
-            if env_thr:
-                try:
-                    mt = float(env_thr); assert 0.0 <= mt <= 1.0
-                    min_threshold = mt
-                except Exception:
-                    pass
+            env_thr = _env_min_threshold(os.environ.get("RC_MIN_RELEVANCE_THRESHOLD"))
+            if env_thr is not None:
+                min_threshold = env_thr
         chunks = extract_chunks(pdf_path)
         if page_filter:
             chunks = [c for c in chunks if c.page_index in page_filter]
         if not chunks:
-            self._write_log(pdf_path, annotation_doc, density_target, [], {}, [], [], min_threshold, reason="no_chunks_extracted_streaming")
+            self._write_log(pdf_path, annotation_doc, density_target, [], {}, [], min_threshold, reason="no_chunks_extracted_streaming")
             return []
-        total_words = sum(len(c.text.split()) for c in chunks)
+        total_words = sum(c.word_count for c in chunks)
         if total_words == 0:
-            self._write_log(pdf_path, annotation_doc, density_target, chunks, {}, [], [], min_threshold, reason="zero_total_words_streaming")
+            self._write_log(pdf_path, annotation_doc, density_target, chunks, {}, [], min_threshold, reason="zero_total_words_streaming")
             return []
         target_words = max(1, int(total_words * density_target))
         scored_map: dict[int, ScoredChunk] = {}
+        position = {c.id: (idx, c) for idx, c in enumerate(chunks)}
+        cache_ctx = self._cache_context(annotation_doc)
+        # Max-heap (via negated relevance) of chunks that may still be emitted. Unscored
+        # chunks count as relevance 0, which only qualifies when the threshold is <= 0.
+        candidates: List[Tuple[float, int, TextChunk]] = []
+        if min_threshold <= 0:
+            candidates = [(-0.0, idx, c) for idx, c in enumerate(chunks)]
         emitted_ids: Set[int] = set()  # chunk ids already emitted as highlights
         selected: List[Highlight] = []
         accumulated_words = 0
+        profile = annotation_doc.global_profile or ""
+        goal = annotation_doc.document_goal or ""
+
+        def score(batch: List[TextChunk]) -> List[ScoredChunk]:
+            cached = self._cache_lookup(batch, cache_ctx)
+            to_score = [c for c in batch if c.id not in cached]
+            batch_scores = self.client.score_chunks(
+                chunks=[{"id": c.id, "text": c.text} for c in to_score],
+                global_profile=profile,
+                document_goal=goal
+            ) if to_score else []
+            self._cache_store(to_score, batch_scores, cache_ctx)
+            return list(cached.values()) + batch_scores
+
+        batches = [chunks[i:i+batch_size] for i in range(0, len(chunks), batch_size)]
+        scored_batches = self._iter_scored_batches(batches, score)
         # Process batches
         cancelled = False
-        for i in range(0, len(chunks), batch_size):
+        for i, batch in zip(range(0, len(chunks), batch_size), batches):
             if should_stop and should_stop():
                 cancelled = True
                 break
-            batch = chunks[i:i+batch_size]
             if on_batch_start:
                 # Provide the lowest page index in this batch (or None if empty)
                 try:
@@ -179,50 +261,38 @@ class LLMHighlighter:
                 except Exception:
                     pass
             try:
-                batch_scores = self.client.score_chunks(
-                    chunks=[{"id": c.id, "text": c.text} for c in batch],
-                    global_profile=annotation_doc.global_profile or "",
-                    document_goal=annotation_doc.document_goal or ""
-                )
+                batch_scores = next(scored_batches)
             except Exception as e:
                 # Write partial log and re-raise so UI can report error
-                scored_chunks_partial = [(c, scored_map.get(c.id).relevance) for c in chunks if c.id in scored_map]
-                self._write_log(pdf_path, annotation_doc, density_target, chunks, scored_map, scored_chunks_partial, selected, min_threshold, reason=f"error_after_{i}_chunks: {e}")
+                self._write_log(pdf_path, annotation_doc, density_target, chunks, scored_map, selected, min_threshold, reason=f"error_after_{i}_chunks: {e}")
                 raise
             for s in batch_scores:
                 scored_map[s.id] = s
-            # Recompute ordering with available scores (missing -> relevance 0)
-            partial_scored: List[Tuple[TextChunk, float]] = []
-            for c in chunks:
-                rel = scored_map.get(c.id).relevance if c.id in scored_map else 0.0
-                partial_scored.append((c, rel))
-            partial_scored.sort(key=lambda x: x[1], reverse=True)
-            # Decide emissions: scan in relevance order like full algorithm
-            for chunk, rel in partial_scored:
+            # Add this batch's scores to the candidate heap (O(k log N) per batch instead of
+            # re-sorting every chunk)
+            for s in batch_scores:
+                entry = position.get(s.id)
+                if entry is not None:
+                    heapq.heappush(candidates, (-s.relevance, entry[0], entry[1]))
+            # Decide emissions: pop in relevance order like full algorithm
+            while candidates:
                 if should_stop and should_stop():
                     cancelled = True
                     break
-                if chunk.id in emitted_ids:
-                    continue
+                neg_rel, _, chunk = candidates[0]
+                rel = -neg_rel
                 if rel < min_threshold:
-                    # Only consider below-threshold if we haven't met target yet; continue scanning
-                    if accumulated_words >= target_words:
-                        # Stop scanning further because list is sorted descending; remaining will be <= rel
-                        break
-                    continue
+                    # Remaining candidates are all below threshold
+                    break
+                heapq.heappop(candidates)
+                current = scored_map[chunk.id].relevance if chunk.id in scored_map else 0.0
+                if chunk.id in emitted_ids or current != rel:
+                    continue  # already emitted, or superseded entry
                 # Select this chunk now
-                rects = [Rect(x1=r[0], y1=r[1], x2=r[2], y2=r[3]) for r in chunk.rects]
-                scored = scored_map.get(chunk.id)
-                phrase = getattr(scored, 'phrase', None) if scored else None
-                if phrase:
-                    note = phrase
-                else:
-                    kw = extract_keywords(chunk.text, max_keywords=4)
-                    note = " ".join(kw) if kw else None
-                hl = Highlight(page_index=chunk.page_index, rects=rects, extracted_text=chunk.text, auto_generated=True, profile_score=rel, color=(255, 170, 90), note=note)
+                hl = _make_highlight(chunk, rel, scored_map.get(chunk.id))
                 selected.append(hl)
                 emitted_ids.add(chunk.id)
-                accumulated_words += len(chunk.text.split())
+                accumulated_words += chunk.word_count
                 try:
                     on_highlight(hl)
                 except Exception:
@@ -231,97 +301,164 @@ class LLMHighlighter:
                     break
             if accumulated_words >= target_words * soft_cap_multiplier:
                 break
+        scored_batches.close()  # cancel batches requested ahead but no longer needed
         # (Optional) fallback if nothing emitted but we have scores and not cancelled
         if not cancelled and not selected and scored_map:
             # find max relevance
             top = max(scored_map.values(), key=lambda s: s.relevance)
-            if top.relevance >= min_threshold:
-                top_chunk = next(c for c in chunks if c.id == top.id)
-                rects = [Rect(x1=r[0], y1=r[1], x2=r[2], y2=r[3]) for r in top_chunk.rects]
-                phrase = getattr(top, 'phrase', None)
-                if phrase:
-                    note = phrase
-                else:
-                    kw = extract_keywords(top_chunk.text, max_keywords=4)
-                    note = " ".join(kw) if kw else None
-                hl = Highlight(page_index=top_chunk.page_index, rects=rects, extracted_text=top_chunk.text, auto_generated=True, profile_score=top.relevance, color=(255, 170, 90), note=note)
+            entry = position.get(top.id)
+            if top.relevance >= min_threshold and entry is not None:
+                top_chunk = entry[1]
+                hl = _make_highlight(top_chunk, top.relevance, top)
                 selected.append(hl)
                 try:
                     on_highlight(hl)
                 except Exception:
                     pass
         # Final log
-        # Build scored_chunks list for logging from final scored_map ordering
-        scored_chunks_final: List[Tuple[TextChunk, float]] = []
-        for c in chunks:
-            rel = scored_map.get(c.id).relevance if c.id in scored_map else 0.0
-            scored_chunks_final.append((c, rel))
-        scored_chunks_final.sort(key=lambda x: x[1], reverse=True)
         reason = "streaming_cancelled" if cancelled else ("streaming_ok" if selected else "streaming_no_selection")
-        self._write_log(pdf_path, annotation_doc, density_target, chunks, scored_map, scored_chunks_final, selected, min_threshold, reason=reason)
+        self._write_log(pdf_path, annotation_doc, density_target, chunks, scored_map, selected, min_threshold, reason=reason)
         return selected
 
     # ---- Internal helpers ----
+    def _cache_context(self, annotation_doc: AnnotationDocument) -> str | None:
+        if self.score_cache is None:
+            return None
+        scorer = getattr(self.client, 'deployment', None) or type(self.client).__name__
+        return ScoreCache.context_key(scorer, annotation_doc.global_profile or "", annotation_doc.document_goal or "")
+
+    def _cache_lookup(self, chunks: List[TextChunk], ctx: str | None) -> dict[int, ScoredChunk]:
+        if ctx is None or not chunks:
+            return {}
+        try:
+            # Repeated text (speaker names, running headers) maps several chunk ids to one key
+            keys: dict[str, List[int]] = {}
+            for c in chunks:
+                keys.setdefault(ScoreCache.chunk_key(c.text, ctx), []).append(c.id)
+            hits = self.score_cache.get_many(keys)
+        except Exception:
+            return {}  # cache is best-effort
+        return {cid: ScoredChunk(id=cid, relevance=rel, rationale=rationale, phrase=phrase)
+                for k, (rel, rationale, phrase) in hits.items() for cid in keys[k]}
+
+    def _cache_store(self, chunks: List[TextChunk], scores: List[ScoredChunk], ctx: str | None):
+        if ctx is None or not scores:
+            return
+        by_id = {c.id: c for c in chunks}
+        try:
+            self.score_cache.put_many([(ScoreCache.chunk_key(by_id[s.id].text, ctx), s) for s in scores if s.id in by_id])
+        except Exception:
+            pass
+
+    def _score_batches(self, batches: List[List[TextChunk]], annotation_doc: AnnotationDocument,
+                       should_stop=None) -> List[List[ScoredChunk]]:
+        """Score batches concurrently (see _iter_scored_batches); results keep batch order.
+
+        Once should_stop() returns true, stops early and returns the leading batches scored so far."""
+        profile = annotation_doc.global_profile or ""
+        goal = annotation_doc.document_goal or ""
+
+        def score(batch: List[TextChunk]) -> List[ScoredChunk]:
+            return self.client.score_chunks(
+                chunks=[{"id": c.id, "text": c.text} for c in batch],
+                global_profile=profile,
+                document_goal=goal
+            )
+
+        results: List[List[ScoredChunk]] = []
+        scored_batches = self._iter_scored_batches(batches, score)
+        for scored in scored_batches:
+            results.append(scored)
+            if should_stop and should_stop():
+                break
+        scored_batches.close()  # cancels batches that have not started
+        return results
+
+    @staticmethod
+    def _iter_scored_batches(batches: List[List[TextChunk]], score):
+        """Yield score(batch) for each batch in order, with up to RC_LLM_CONCURRENCY calls in flight.
+
+        Scoring is network-bound, so a small window of concurrent calls cuts wall
+        time roughly by the window size. The first failure propagates; closing the
+        generator early cancels batches that have not started."""
+        window = min(_scoring_concurrency(), len(batches))
+        if window <= 1:
+            for batch in batches:
+                yield score(batch)
+            return
+        pool = ThreadPoolExecutor(max_workers=window, thread_name_prefix="llm-score")
+        try:
+            queued = iter(batches)
+            in_flight = deque(pool.submit(score, b) for b in islice(queued, window))
+            while in_flight:
+                result = in_flight.popleft().result()
+                nxt = next(queued, None)
+                if nxt is not None:
+                    in_flight.append(pool.submit(score, nxt))  # keep the window full while the caller works
+                yield result
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     def _log_dir(self) -> str:
         # Allow override via environment variable
         env_override = os.environ.get("RC_LOG_DIR")
+        cwd = os.getcwd()
+        key = (env_override, cwd)
+        cached = _LOG_DIR_CACHE.get(key)
+        if cached is not None:
+            return cached
         if env_override:
             base = env_override
         else:
             # Default: repository-root / logs (walk upwards until we find a marker).
             # Fallback to current working directory if detection fails.
-            base = self._detect_repo_root() or os.getcwd()
+            base = self._detect_repo_root() or cwd
             base = os.path.join(base, "logs")
         os.makedirs(base, exist_ok=True)
+        _LOG_DIR_CACHE[key] = base
         return base
 
     def _detect_repo_root(self) -> str | None:
-        markers = {".git", "README.md", "requirements.txt"}
-        path = os.path.abspath(os.getcwd())
-        for _ in range(10):  # limit climb depth
-            if any(os.path.exists(os.path.join(path, m)) for m in markers):
-                return path
-            parent = os.path.dirname(path)
-            if parent == path:
-                break
-            path = parent
-        return None
+        return _find_repo_root(os.path.abspath(os.getcwd()))
 
-    def _next_log_filename(self, base_dir: str) -> str:
-        """Return next incremental log filename: llm_run_<n>.json.
+    def _open_next_log(self, base_dir: str):
+        """Create and open the next incremental log file: llm_run_<n>.json.
 
-        Persistence strategy:
-          1. Maintain a small counter file 'llm_run_counter.txt' in the log dir.
-          2. If missing/corrupt, derive next number by scanning existing llm_run_*.json files.
-        Thread-safety: best-effort (single-user desktop context)."""
-        counter_path = Path(base_dir) / "llm_run_counter.txt"
-        n = None
-        if counter_path.exists():
+        'llm_run_counter.txt' holds the last number used and is only a hint: the
+        name is claimed with O_CREAT|O_EXCL and bumped on collision, so a missing
+        or stale counter never requires scanning the directory.
+        Returns (path, binary file object)."""
+        counter_path = os.path.join(base_dir, "llm_run_counter.txt")
+        try:
+            with open(counter_path, encoding="utf-8") as f:
+                n = int(f.read().strip()) + 1
+        except (OSError, ValueError):
+            n = 1
+        while True:
+            path = os.path.join(base_dir, f"llm_run_{n}.json")
             try:
-                raw = counter_path.read_text(encoding="utf-8").strip()
-                n = int(raw)
-            except Exception:
-                n = None
-        if n is None:
-            # scan existing
-            max_n = 0
-            for name in os.listdir(base_dir):
-                if name.startswith("llm_run_") and name.endswith(".json"):
-                    mid = name[len("llm_run_"):-len(".json")]
-                    if mid.isdigit():
-                        max_n = max(max_n, int(mid))
-            n = max_n
-        n += 1
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+                break
+            except FileExistsError:
+                n += 1
+            except FileNotFoundError:
+                os.makedirs(base_dir, exist_ok=True)  # removed since _log_dir() cached it
         try:
-            counter_path.write_text(str(n), encoding="utf-8")
-        except Exception:
+            with open(counter_path, "w", encoding="utf-8") as f:
+                f.write(str(n))
+        except OSError:
             pass
-        return f"llm_run_{n}.json"
+        return path, os.fdopen(fd, "wb")
 
     def _write_log(self, pdf_path: str, annotation_doc: AnnotationDocument, density_target: float,
-                   chunks: List[TextChunk], scored_map: dict, scored_chunks: List[Tuple[TextChunk, float]],
+                   chunks: List[TextChunk], scored_map: dict,
                    selected: List[Highlight], min_threshold: float, reason: str):
+        level = os.environ.get("RC_LOG_LEVEL", "info").lower()
+        if level == "off":
+            self.last_log_path = None
+            return
         try:
+            get = scored_map.get
             log = {
                 "timestamp": datetime.utcnow().isoformat() + "Z",
                 "pdf_path": pdf_path,
@@ -340,21 +477,19 @@ class LLMHighlighter:
                         "text_preview": c.text[:500]
                     } for c in chunks
                 ],
-                # Comprehensive scores: ensure every chunk appears exactly once; fill missing with 0 relevance.
+                # Comprehensive scores in chunk order: every chunk appears exactly once; missing ones get 0 relevance.
                 "scores": [
                     {
                         "id": c.id,
                         "page_index": c.page_index,
-                        "relevance": (scored_map.get(c.id).relevance if c.id in scored_map else 0.0),
-                        "rationale_preview": (scored_map.get(c.id).rationale[:300] if c.id in scored_map and getattr(scored_map.get(c.id), 'rationale', None) else "")
-                    } for (c, rel) in scored_chunks
+                        "relevance": (s.relevance if s is not None else 0.0),
+                        "rationale_preview": ((s.rationale or "")[:300] if s is not None else "")
+                    } for c in chunks for s in (get(c.id),)
                 ],
-                "scored_order": [
-                    {
-                        "id": c.id,
-                        "relevance": rel,
-                        "page_index": c.page_index
-                    } for (c, rel) in scored_chunks
+                # Ranking summary: top 20 is O(N log 20); the full ordering only at RC_LOG_LEVEL=debug
+                "top_20_by_relevance": [
+                    {"id": s.id, "relevance": s.relevance}
+                    for s in heapq.nlargest(20, scored_map.values(), key=lambda s: s.relevance)
                 ],
                 "selected": [
                     {
@@ -365,11 +500,14 @@ class LLMHighlighter:
                     } for idx, hl in enumerate(selected)
                 ]
             }
-            log_dir = self._log_dir()
-            fname = self._next_log_filename(log_dir)
-            path = os.path.join(log_dir, fname)
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(log, f, indent=2)
+            if level == "debug":
+                # Chunk ids in relevance order (relevance/page are already in "scores")
+                rels = _relevances(chunks, scored_map)
+                log["scored_order"] = [chunks[i].id for i in sorted(range(len(chunks)), key=rels.__getitem__, reverse=True)]
+            data = jsonio.dumps_pretty(log)
+            path, f = self._open_next_log(self._log_dir())
+            with f:
+                f.write(data)
             self.last_log_path = path
         except Exception:
             self.last_log_path = None
@@ -1,12 +1,9 @@
 from __future__ import annotations
-from typing import List, Tuple, Optional
-try:
-    from pypdf import PdfReader  # type: ignore
-except ImportError as e:  # pragma: no cover
-    raise ImportError(
-        "Missing dependency 'pypdf'. Activate your virtual environment and run 'pip install -r requirements.txt'. "
-        "If already installed, ensure you're not invoking system Python instead of the venv."
-    ) from e
+from typing import Dict, List, Tuple, Optional
+from collections import OrderedDict
+import mmap
+import threading
+import time
 
 """pdf_loader
 
@@ -23,27 +20,155 @@ Limitations vs PyMuPDF:
 
 try:
     from PySide6.QtPdf import QPdfDocument  # type: ignore
-    from PySide6.QtGui import QImage
+    from PySide6.QtGui import QImage, QPainter
+    from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QRunnable, QSize, QThread, QThreadPool, Qt
     HAVE_QPDF = True
 except Exception:  # pragma: no cover - environment dependent
     HAVE_QPDF = False
     QPdfDocument = None  # type: ignore
     QImage = None  # type: ignore
+    QRunnable = object  # type: ignore
+
+
+def _open_reader(source):
+    # pypdf is imported on first use: it costs ~100 ms to import, and with QtPdf present
+    # the viewer only needs it for page sizes. `source` is a path or a seekable stream.
+    try:
+        from pypdf import PdfReader  # type: ignore
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "Missing dependency 'pypdf'. Activate your virtual environment and run 'pip install -r requirements.txt'. "
+            "If already installed, ensure you're not invoking system Python instead of the venv."
+        ) from e
+    return PdfReader(source)
+
+
+def _map_file(path: str) -> mmap.mmap:
+    """Read-only mapping of a whole file.
+
+    Given a path, pypdf reads the entire file into a BytesIO; reading through a mapping
+    instead faults in only the parts it seeks to, from the shared page cache.
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, 'MADV_RANDOM'):  # xref table at the end, objects all over: no readahead
+        mm.madvise(mmap.MADV_RANDOM)
+    return mm
+
+
+# Rendered pages are kept in a small LRU so scrolling back does not re-rasterize.
+# Bounded by entry count and by total image bytes, whichever is hit first.
+RENDER_CACHE_MAX_PAGES = 32
+RENDER_CACHE_MAX_BYTES = 128 << 20
+PREFETCH_THREADS = 2
+# Pages evicted from that LRU are kept JPEG-compressed (~20-200x smaller) in a second,
+# byte-bounded LRU -- but only pages that took longer to render than a JPEG takes to
+# decode (a few ms); cheap pages are simply rendered again.
+COLD_CACHE_MAX_BYTES = 32 << 20
+COLD_CACHE_MIN_RENDER_SECONDS = 0.015
+COLD_CACHE_JPEG_QUALITY = 85
+
+
+def _rasterize(qpdf: 'QPdfDocument', index: int, size: 'QSize') -> 'QImage':
+    """Render a page and premultiply it once, so QPixmap.fromImage can share the pixels.
+
+    QtPdf returns Format_ARGB32; raster pixmaps store ARGB32_Premultiplied, so handing
+    the raw render to fromImage converts (and copies) the whole page on the UI thread
+    every time. Converting here does it once per render, off the UI thread for prefetches.
+    """
+    img = qpdf.render(index, size)
+    if not img.isNull():
+        img.convertTo(QImage.Format.Format_ARGB32_Premultiplied)
+    return img
+
+
+def _compress(img: 'QImage') -> 'QByteArray':
+    # JPEG has no alpha: flatten onto white, which is what the viewer shows behind a page
+    flat = QImage(img.size(), QImage.Format.Format_RGB32)
+    flat.fill(Qt.GlobalColor.white)
+    painter = QPainter(flat)
+    painter.drawImage(0, 0, img)
+    painter.end()
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    flat.save(buf, "JPEG", COLD_CACHE_JPEG_QUALITY)
+    buf.close()
+    return data
+
+
+class _PrefetchJob(QRunnable):
+    """Background render of one page into the owning document's cache."""
+    def __init__(self, doc: 'PDFDocument', key: Tuple[int, int, int]):
+        super().__init__()
+        self.setAutoDelete(False)  # kept alive by doc._pending_renders until run() finishes
+        self._doc = doc
+        self._key = key
+        self.done = threading.Event()  # set once run() has finished, successful or not
+
+    def run(self):
+        doc, key = self._doc, self._key
+        try:
+            if not doc._closed:
+                started = time.perf_counter()
+                img = _rasterize(doc._qpdf, key[0], QSize(key[1], key[2]))
+                slow = time.perf_counter() - started >= COLD_CACHE_MIN_RENDER_SECONDS
+                if not img.isNull():
+                    evicted = []
+                    with doc._render_lock:
+                        if not doc._closed:
+                            evicted = doc._cache_render(key, img, slow)
+                    doc._store_cold(evicted)
+        finally:
+            with doc._render_lock:
+                if doc._pending_renders.get(key) is self:
+                    del doc._pending_renders[key]
+            self.done.set()
 
 
 class PDFDocument:
     def __init__(self, path: str):
         self.path = path
-        self.reader = PdfReader(path)
+        self._reader = None  # pypdf reader, opened on first use
+        self._file_map: Optional[mmap.mmap] = None  # backs _reader
+        self._page_points: Optional[List[Tuple[float, float]]] = None  # QtPdf page sizes in points, read once
         self._qpdf: Optional[QPdfDocument] = None
+        # (index, target_w, target_h) -> QImage; QImage is implicitly shared, so hits are cheap
+        self._render_cache: OrderedDict[Tuple[int, int, int], QImage] = OrderedDict()
+        self._render_cache_bytes = 0
+        self._slow_renders: set = set()  # keys whose render took COLD_CACHE_MIN_RENDER_SECONDS or more
+        # key -> JPEG bytes of pages evicted from _render_cache (see COLD_CACHE_MAX_BYTES)
+        self._cold_cache: OrderedDict[Tuple[int, int, int], QByteArray] = OrderedDict()
+        self._cold_cache_bytes = 0
+        # Guards the caches and pending jobs; prefetch jobs run on _render_pool threads
+        self._render_lock = threading.Lock()
+        self._pending_renders: dict[Tuple[int, int, int], _PrefetchJob] = {}
+        self._render_pool = None
+        self._closed = False
+        # page index -> text lines with geometry; filled by one layout pass on first use
+        self._layout_cache: Optional[Dict[int, list]] = None
         if HAVE_QPDF:
             self._qpdf = QPdfDocument()
             status = self._qpdf.load(path)
             # status 0 = success; ignore others for now
+        # asked on every scroll/page-label update; QtPdf already parsed the page tree
+        qpdf_pages = self._qpdf.pageCount() if self._qpdf is not None else 0
+        self._page_count = qpdf_pages or len(self.reader.pages)
+
+    @property
+    def reader(self):
+        if self._reader is None:
+            try:
+                self._file_map = _map_file(self.path)
+            except (OSError, ValueError):  # e.g. empty file, which mmap refuses
+                self._reader = _open_reader(self.path)
+            else:
+                self._reader = _open_reader(self._file_map)
+        return self._reader
 
     # ---- Basic Metadata ----
     def page_count(self) -> int:
-        return len(self.reader.pages)
+        return self._page_count
 
     def get_page_size(self, index: int) -> Tuple[float, float]:
         page = self.reader.pages[index]
@@ -53,37 +178,226 @@ class PDFDocument:
         return width, height
 
     # ---- Rendering ----
-    def render_page(self, index: int, zoom: float = 1.3):
+    def render_page(self, index: int, zoom: float = 1.3, prefetch: int = 0):
         """Render a page to QImage, returning (image, width, height).
 
         With QtPdf available we can render natively. Otherwise we raise an informative error.
         Future fallback: integrate pillow + ghostscript/poppler for headless rasterization if needed.
+        `prefetch` > 0 queues background renders of that many pages on each side of `index`.
         """
         if not HAVE_QPDF or self._qpdf is None:
             raise RuntimeError("QtPdf (QPdfDocument) not available in this PySide6 build. Install PySide6-Essentials with QtPdf support.")
-        from PySide6.QtCore import QSize
-        page_size = self._qpdf.pagePointSize(index)
-        target_w = max(1, int(page_size.width() * zoom))
-        target_h = max(1, int(page_size.height() * zoom))
-        size = QSize(target_w, target_h)
-        # QPdfDocument.render returns a QImage in this signature
-        img = self._qpdf.render(index, size)
-        if img.isNull():  # pragma: no cover
-            raise RuntimeError("Failed to render PDF page: received null image from QPdfDocument.render")
+        key = self._render_key(index, zoom)
+        _, target_w, target_h = key
+        running = None
+        with self._render_lock:
+            img = self._render_cache.get(key)
+            if img is not None:
+                self._render_cache.move_to_end(key)
+            else:
+                job = self._pending_renders.pop(key, None)
+                # Not started yet: render it here instead. Already rendering: wait for it
+                # rather than rasterizing the same page twice.
+                if job is not None and not self._render_pool.tryTake(job):
+                    running = job
+        if running is not None:
+            running.done.wait()
+            with self._render_lock:
+                img = self._render_cache.get(key)
+        if img is None:
+            img = self._from_cold(key)
+        if img is None:
+            started = time.perf_counter()
+            img = _rasterize(self._qpdf, index, QSize(target_w, target_h))
+            if img.isNull():  # pragma: no cover
+                raise RuntimeError("Failed to render PDF page: received null image from QPdfDocument.render")
+            slow = time.perf_counter() - started >= COLD_CACHE_MIN_RENDER_SECONDS
+            with self._render_lock:
+                evicted = self._cache_render(key, img, slow)
+            self._store_cold(evicted)
+        if prefetch > 0:
+            self.prefetch(range(index - prefetch, index + prefetch + 1), zoom)
         return img, target_w, target_h
 
+    def cached_render(self, index: int, zoom: float = 1.3) -> Optional['QImage']:
+        """The image render_page would return if it is already cached, else None. Never renders."""
+        if not HAVE_QPDF or self._qpdf is None:
+            return None
+        key = self._render_key(index, zoom)
+        with self._render_lock:
+            img = self._render_cache.get(key)
+            if img is not None:
+                self._render_cache.move_to_end(key)
+                return img
+        return self._from_cold(key)
+
+    def prefetch(self, indices, zoom: float = 1.3):
+        """Render the given pages in the background, in the order given; queued pages
+        outside `indices` are dropped.
+
+        Keeps sequential reading instant while rapid jumps do not pile up stale work.
+        """
+        if not HAVE_QPDF or self._qpdf is None or self._closed:
+            return
+        count = self._qpdf.pageCount()
+        keys = [self._render_key(i, zoom) for i in indices if 0 <= i < count]
+        wanted = set(keys)
+        with self._render_lock:
+            if self._render_pool is None:
+                self._render_pool = QThreadPool()
+                self._render_pool.setMaxThreadCount(PREFETCH_THREADS)
+                # speculative work: on-demand renders and the UI thread go first
+                self._render_pool.setThreadPriority(QThread.Priority.LowPriority)
+            for key, job in list(self._pending_renders.items()):
+                if key not in wanted and self._render_pool.tryTake(job):
+                    del self._pending_renders[key]
+            for key in keys:
+                if key in self._render_cache or key in self._pending_renders:
+                    continue
+                job = _PrefetchJob(self, key)
+                self._pending_renders[key] = job
+                self._render_pool.start(job)
+
+    def render_size(self, index: int, zoom: float = 1.3) -> Tuple[int, int]:
+        """Pixel size render_page would produce, without rendering."""
+        if not HAVE_QPDF or self._qpdf is None:
+            raise RuntimeError("QtPdf (QPdfDocument) not available in this PySide6 build. Install PySide6-Essentials with QtPdf support.")
+        _, w, h = self._render_key(index, zoom)
+        return w, h
+
+    def page_sizes(self, zoom: float = 1.3) -> List[Tuple[int, int]]:
+        """render_size of every page, in page order, without a Qt call per page."""
+        if not HAVE_QPDF or self._qpdf is None:
+            raise RuntimeError("QtPdf (QPdfDocument) not available in this PySide6 build. Install PySide6-Essentials with QtPdf support.")
+        return [(max(1, int(w * zoom)), max(1, int(h * zoom))) for w, h in self._point_sizes()]
+
+    def _point_sizes(self) -> List[Tuple[float, float]]:
+        # Read once, on the first full layout; page sizes never change
+        points = self._page_points
+        if points is None:
+            size_of = self._qpdf.pagePointSize
+            points = self._page_points = [size_of(i).toTuple() for i in range(self._qpdf.pageCount())]
+        return points
+
+    def _render_key(self, index: int, zoom: float) -> Tuple[int, int, int]:
+        # Before any layout pass (single-page mode, prefetch) only the pages asked for are
+        # touched; reading every page size for one page would defeat QtPdf's lazy loading.
+        points = self._page_points
+        if points is not None and 0 <= index < len(points):
+            w, h = points[index]
+        else:
+            w, h = self._qpdf.pagePointSize(index).toTuple()
+        return index, max(1, int(w * zoom)), max(1, int(h * zoom))
+
+    def _cache_render(self, key: Tuple[int, int, int], img, slow: bool = False):
+        """Insert into the LRU and evict past the limits. Caller holds _render_lock.
+
+        Returns the evicted (key, image) pairs worth keeping compressed; pass them to
+        _store_cold after releasing the lock.
+        """
+        if slow:
+            self._slow_renders.add(key)
+        old = self._render_cache.pop(key, None)
+        if old is not None:
+            self._render_cache_bytes -= old.sizeInBytes()
+        self._render_cache[key] = img
+        self._render_cache_bytes += img.sizeInBytes()
+        cold = []
+        while self._render_cache and (len(self._render_cache) > RENDER_CACHE_MAX_PAGES
+                                      or self._render_cache_bytes > RENDER_CACHE_MAX_BYTES):
+            old_key, evicted = self._render_cache.popitem(last=False)
+            self._render_cache_bytes -= evicted.sizeInBytes()
+            if old_key in self._slow_renders:
+                if old_key in self._cold_cache:
+                    self._cold_cache.move_to_end(old_key)
+                else:
+                    cold.append((old_key, evicted))
+        return cold
+
+    def _store_cold(self, evicted):
+        """JPEG-encode pages evicted by _cache_render into the cold LRU (outside the lock)."""
+        for key, img in evicted:
+            data = _compress(img)
+            with self._render_lock:
+                if self._closed or key in self._cold_cache:
+                    continue
+                self._cold_cache[key] = data
+                self._cold_cache_bytes += data.size()
+                while self._cold_cache_bytes > COLD_CACHE_MAX_BYTES and len(self._cold_cache) > 1:
+                    _, old = self._cold_cache.popitem(last=False)
+                    self._cold_cache_bytes -= old.size()
+
+    def _from_cold(self, key: Tuple[int, int, int]) -> Optional['QImage']:
+        """Decode a compressed page back into the render cache; None if it is not there.
+
+        The JPEG stays in the cold LRU, so the page is not encoded again when evicted.
+        """
+        with self._render_lock:
+            data = self._cold_cache.get(key)
+            if data is None:
+                return None
+            self._cold_cache.move_to_end(key)
+        img = QImage.fromData(data, "JPEG")
+        if img.isNull():  # pragma: no cover
+            return None
+        with self._render_lock:
+            evicted = self._cache_render(key, img)
+        self._store_cold(evicted)
+        return img
+
     # ---- Text Extraction ----
+    def _page_lines(self) -> Dict[int, list]:
+        """Positioned text lines per page, parsed once and shared by the methods below."""
+        if self._layout_cache is None:
+            from .text_extraction import iter_lines_with_bbox  # lazy: pulls in the layout backend
+            cache: Dict[int, list] = {}
+            for line in iter_lines_with_bbox(self.path):
+                cache.setdefault(line[0], []).append(line)
+            self._layout_cache = cache
+        return self._layout_cache
+
     def extract_text_blocks(self, index: int):
         """Return a naive single block of full page text.
 
-        pypdf does not yield positioned blocks. We return a list with one synthetic block:
-        [(0, 0, width, height, text, 0, 0)] to maintain prior interface compatibility.
+        We return a list with one synthetic block: [(0, 0, width, height, text, 0, 0)]
+        to maintain prior interface compatibility. Text comes from the shared layout pass.
         """
         width, height = self.get_page_size(index)
-        page = self.reader.pages[index]
-        text = page.extract_text() or ""
+        text = "".join(line[2] for line in self._page_lines().get(index, ()))
         return [(0.0, 0.0, width, height, text, 0, 0)]
 
+    def chunks(self, max_chars: int = 1200, merge_distance: float = 12.0, invert_y: bool = True):
+        """Text chunks for LLM scoring (see text_extraction.extract_chunks).
+
+        Reuses this document's layout pass when it has already run; otherwise goes
+        through extract_chunks and its on-disk cache.
+        """
+        from .text_extraction import chunks_from_lines, extract_chunks
+        if self._layout_cache is None:
+            return extract_chunks(self.path, max_chars, merge_distance, invert_y)
+        lines = self._layout_cache
+        return chunks_from_lines((line for page in sorted(lines) for line in lines[page]),
+                                 max_chars, merge_distance, invert_y)
+
     def close(self):
-        # pypdf has no explicit close; kept for interface symmetry
-        pass
+        # pypdf has no explicit close; stop prefetching, release the render cache and unmap the file
+        with self._render_lock:
+            self._closed = True
+            if self._render_pool is not None:
+                for job in self._pending_renders.values():
+                    self._render_pool.tryTake(job)
+            self._pending_renders.clear()
+        if self._render_pool is not None:
+            self._render_pool.waitForDone()
+        with self._render_lock:
+            self._render_cache.clear()
+            self._render_cache_bytes = 0
+            self._cold_cache.clear()
+            self._cold_cache_bytes = 0
+        if self._file_map is not None:
+            self._reader = None  # reopened (and remapped) if used again
+            try:
+                self._file_map.close()
+            except BufferError:  # pragma: no cover - a view is still exported; unmapped when collected
+                pass
+            self._file_map = None
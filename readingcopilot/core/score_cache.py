@@ -0,0 +1,86 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Tuple
+from hashlib import blake2b
+from pathlib import Path
+import os, sqlite3, threading
+
+from .llm_client import ScoredChunk
+
+# Persistent cache of LLM relevance scores.
+# Key = hash(chunk text) + hash(profile) + hash(goal) + scorer identity, so
+# re-running on an unchanged PDF/profile (the usual refinement loop) skips the
+# LLM for every chunk already scored. Location: ~/.readingcopilot/score_cache/
+# (override with RC_SCORE_CACHE_DIR; RC_SCORE_CACHE=off disables the default cache).
+
+
+def _h(text: str, size: int) -> str:
+    return blake2b(text.encode('utf-8'), digest_size=size).hexdigest()
+
+
+class ScoreCache:
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " key TEXT PRIMARY KEY, relevance REAL NOT NULL, rationale TEXT, phrase TEXT)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def default() -> Optional['ScoreCache']:
+        """Shared cache at the default location, or None if disabled/unavailable."""
+        global _DEFAULT
+        if os.environ.get("RC_SCORE_CACHE", "").lower() in ("0", "off", "false", "no"):
+            return None
+        with _DEFAULT_LOCK:
+            if _DEFAULT is None:
+                base = os.environ.get("RC_SCORE_CACHE_DIR") or str(Path.home() / ".readingcopilot" / "score_cache")
+                try:
+                    _DEFAULT = ScoreCache(os.path.join(base, "scores.sqlite3"))
+                except (OSError, sqlite3.Error):
+                    return None
+            return _DEFAULT
+
+    @staticmethod
+    def context_key(scorer: str, global_profile: str, document_goal: str) -> str:
+        """Key suffix shared by every chunk scored under one profile/goal/scorer."""
+        return f"{_h(global_profile, 8)}_{_h(document_goal, 8)}_{_h(scorer, 4)}"
+
+    @staticmethod
+    def chunk_key(text: str, context_key: str) -> str:
+        return f"{_h(text, 16)}_{context_key}"
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[float, str, Optional[str]]]:
+        keys = list(keys)
+        out: Dict[str, Tuple[float, str, Optional[str]]] = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+                part = keys[i:i+500]
+                rows = self._conn.execute(
+                    f"SELECT key, relevance, rationale, phrase FROM scores WHERE key IN ({','.join('?' * len(part))})",
+                    part,
+                ).fetchall()
+                for key, rel, rationale, phrase in rows:
+                    out[key] = (rel, rationale or "", phrase)
+        return out
+
+    def put_many(self, items: List[Tuple[str, ScoredChunk]]):
+        if not items:
+            return
+        with self._lock:
+            with self._conn:  # one transaction
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO scores (key, relevance, rationale, phrase) VALUES (?, ?, ?, ?)",
+                    [(k, s.relevance, s.rationale, s.phrase) for k, s in items],
+                )
+
+
+_DEFAULT: Optional[ScoreCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+__all__ = ["ScoreCache"]
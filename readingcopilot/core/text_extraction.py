@@ -1,135 +1,372 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple, Iterable
+from typing import List, Tuple, Iterable, Iterator
+import os
 import re
+import pickle
+import multiprocessing
+from hashlib import blake2b
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from pypdf import PdfReader  # leverage already-installed dependency for page size
 
+# Two layout backends feed extract_chunks through iter_lines_with_bbox():
+#   pdfminer - pdfminer.six (pure Python layout analysis; the default)
+#   pdfium   - pypdfium2 (optional, native text engine; several times faster on large PDFs)
+# pdfium is opt-in (RC_PDF_BACKEND=pdfium): it reports no blank lines, so paragraphs are
+# split on vertical gaps only and chunk boundaries can differ from pdfminer's. It is
+# also used when pdfminer is not installed.
+try:
+    import pypdfium2 as pdfium  # type: ignore
+except Exception:  # pragma: no cover - environment dependent
+    pdfium = None  # type: ignore
+
 try:
     from pdfminer.high_level import extract_pages  # type: ignore
     from pdfminer.layout import LTTextContainer, LTTextLine  # type: ignore
 except Exception as e:  # pragma: no cover - environment dependent
-    raise ImportError(
-        "pdfminer.six is required for LLM highlighting. Install with 'pip install pdfminer.six'."
-        f" (Import error: {e})"
-    )
+    if pdfium is None:
+        raise ImportError(
+            "pdfminer.six is required for LLM highlighting. Install with 'pip install pdfminer.six'."
+            f" (Import error: {e})"
+        )
+    extract_pages = None  # type: ignore
+    LTTextContainer = LTTextLine = ()  # type: ignore
 
-@dataclass
+Line = Tuple[int, float, str, Tuple[float, float, float, float]]
+
+@dataclass(slots=True)  # ~10k chunks on a large PDF; no per-instance __dict__
 class TextChunk:
     id: int
     page_index: int
     text: str
     rects: List[Tuple[float,float,float,float]]  # list of (x1,y1,x2,y2)
     char_count: int
+    word_count: int = -1  # whitespace-separated words; computed once from text when not given
+
+    def __post_init__(self):
+        if self.word_count < 0:
+            self.word_count = len(self.text.split())
 
 
 def _iter_text_lines(layout_obj) -> Iterable[LTTextLine]:
-    if isinstance(layout_obj, LTTextLine):
-        yield layout_obj
-    elif isinstance(layout_obj, LTTextContainer):
-        for line in layout_obj:
-            yield from _iter_text_lines(line)
-    else:
-        if hasattr(layout_obj, '__iter__'):
-            for child in layout_obj:
-                yield from _iter_text_lines(child)
+    # Iterative depth-first walk over a stack of child iterators instead of recursive
+    # `yield from`: lines are yielded straight from their box's loop (no generator frame
+    # per nesting level) and deeply nested layouts cannot hit the recursion limit.
+    text_line, iterable_types = LTTextLine, _ITERABLE_TYPES
+    stack = [iter((layout_obj,))]
+    push, pop = stack.append, stack.pop
+    while stack:
+        for obj in stack[-1]:
+            if isinstance(obj, text_line):
+                yield obj
+                continue
+            cls = type(obj)
+            iterable = iterable_types.get(cls)
+            if iterable is None:
+                iterable = iterable_types[cls] = isinstance(obj, LTTextContainer) or hasattr(obj, '__iter__')
+            if iterable:
+                push(iter(obj))
+                break  # descend; this level resumes where it left off
+        else:
+            pop()
+
+_ITERABLE_TYPES: dict = {}  # layout class -> whether it has children to walk
+
+
+def _pdf_backend() -> str:
+    if pdfium is not None and os.environ.get("RC_PDF_BACKEND", "").lower() == "pdfium":
+        return "pdfium"
+    return "pdfminer" if extract_pages is not None else "pdfium"
+
+
+# pdfminer layout analysis is CPU-bound Python, so large PDFs are split into page
+# ranges analyzed in worker processes (RC_EXTRACT_WORKERS; 1 disables, default min(CPUs, 8)).
+PARALLEL_MIN_PAGES = 16
+
+
+def _extract_workers(n_pages: int) -> int:
+    if n_pages < PARALLEL_MIN_PAGES:
+        return 1
+    try:
+        workers = int(os.environ.get("RC_EXTRACT_WORKERS", "0"))
+    except ValueError:
+        workers = 0
+    if workers <= 0:
+        cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+        workers = min(cpus, 8)
+    return min(workers, n_pages)
+
+
+def _pdfminer_page_lines(pdf_path: str, page_numbers: List[int]) -> List[Line]:
+    """Worker: lines for the given (sorted) pages; runs in a child process."""
+    out: List[Line] = []
+    for page_index, page_layout in zip(page_numbers, extract_pages(pdf_path, page_numbers=page_numbers)):
+        page_h = page_layout.height
+        for line in _iter_text_lines(page_layout):
+            out.append((page_index, page_h, line.get_text(), line.bbox))
+    return out
+
+
+def _iter_lines_pdfminer(pdf_path: str) -> Iterator[Line]:
+    # Page heights come from pdfminer's own LTPage (mediabox after /Rotate), the same
+    # space its line bboxes use; pypdf is only asked for the page count.
+    n_pages = len(PdfReader(pdf_path).pages)
+    workers = _extract_workers(n_pages)
+    if workers > 1:
+        # A few ranges per worker evens out pages of very different density
+        n_ranges = min(n_pages, workers * 4)
+        step = -(-n_pages // n_ranges)
+        ranges = [list(range(i, min(i + step, n_pages))) for i in range(0, n_pages, step)]
+        # spawn, not fork: callers (Qt UI, API worker threads) are multi-threaded
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for lines in pool.map(_pdfminer_page_lines, [pdf_path] * len(ranges), ranges):
+                yield from lines
+        return
+    for page_index, page_layout in enumerate(extract_pages(pdf_path)):
+        page_h = page_layout.height
+        for line in _iter_text_lines(page_layout):
+            yield page_index, page_h, line.get_text(), line.bbox
+
+
+def _iter_lines_pdfium(pdf_path: str) -> Iterator[Line]:
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        for page_index in range(len(pdf)):
+            page = pdf[page_index]
+            textpage = page.get_textpage()
+            try:
+                page_h = float(page.get_height())
+                # pdfium groups characters into text rects (roughly one per line run),
+                # already in bottom-left PDF user space like pdfminer's bboxes.
+                for i in range(textpage.count_rects()):
+                    left, bottom, right, top = textpage.get_rect(i)
+                    text = textpage.get_text_bounded(left, bottom, right, top)
+                    yield page_index, page_h, text.replace("\r\n", "\n").rstrip("\n") + "\n", (left, bottom, right, top)
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def iter_lines_with_bbox(pdf_path: str) -> Iterator[Line]:
+    """Yield (page_index, page_height, text, (x0, y0, x1, y1)) for every text line.
+
+    Boxes are in PDF user space (origin bottom-left) and line text ends with a newline.
+    With pdfminer, whitespace-only lines mark paragraph breaks (its LTTextLine output);
+    the pdfium backend yields one entry per text rect and no blank lines, so only
+    vertical gaps separate its paragraphs.
+    """
+    if _pdf_backend() == "pdfium":
+        return _iter_lines_pdfium(pdf_path)
+    return _iter_lines_pdfminer(pdf_path)
+
+
+def merge_line_rects(rects: List[Tuple[float, float, float, float]], x_tol: float = 4.0) -> List[Tuple[float, float, float, float]]:
+    """Merge consecutive line rects that share a column into one box each.
+
+    Lines whose left and right edges are within x_tol of the running box, and whose
+    vertical gap to it is no more than their own height, are folded into it. A
+    justified paragraph becomes one box (plus its short last line); ragged or
+    multi-column text keeps separate boxes, so no blank area gets highlighted.
+    """
+    merged: List[Tuple[float, float, float, float]] = []
+    for r in rects:
+        if merged:
+            m = merged[-1]
+            gap = max(r[1] - m[3], m[1] - r[3])
+            if abs(m[0] - r[0]) < x_tol and abs(m[2] - r[2]) < x_tol and gap <= r[3] - r[1]:
+                merged[-1] = (min(m[0], r[0]), min(m[1], r[1]), max(m[2], r[2]), max(m[3], r[3]))
+                continue
+        merged.append(r)
+    return merged
 
 
-SENTENCE_REGEX = re.compile(r"(?<!\b[A-Z])(?<=[.!?])\s+(?=[A-Z0-9])")
+# A boundary is whitespace after . ! or ? that precedes an uppercase letter or digit.
+# (An earlier `(?<!\b[A-Z])` guard could never match right after punctuation and only
+# cost time; it is dropped.) Lookbehind rules out re2/DFA engines; stdlib re is fine here.
+SENTENCE_REGEX = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9])")
 
 def split_into_sentences(text: str) -> List[str]:
     """Split text into sentences conservatively.
 
-    Uses a regex that attempts not to split on common abbreviations (rough heuristic: avoids single capital letter before period rule by negative lookbehind).
-    Falls back to the whole text if no boundary found.
+    Splits only on whitespace that follows sentence punctuation and precedes an uppercase
+    letter or digit. Falls back to the whole text if no boundary found.
     """
     raw = text.strip()
     if not raw:
         return []
-    parts = SENTENCE_REGEX.split(raw)
+    if "." not in raw and "!" not in raw and "?" not in raw:
+        return [raw]  # no possible boundary; skip the regex scan
     # Clean & keep non-empty
-    return [p.strip() for p in parts if p.strip()]
+    return [s for p in SENTENCE_REGEX.split(raw) if (s := p.strip())]
+
+# On-disk cache of extract_chunks results, keyed by PDF content hash + parameters +
+# backend, so re-opening a PDF skips layout analysis entirely.
+# Location: ~/.readingcopilot/chunk_cache/ (override with RC_CHUNK_CACHE_DIR;
+# RC_CHUNK_CACHE=off disables). Bump CHUNK_CACHE_VERSION whenever chunking output changes.
+CHUNK_CACHE_VERSION = 3
+_HASH_MEMO: dict[tuple, str] = {}  # (path, mtime_ns, size) -> content hash
+
+
+def _chunk_cache_dir() -> Path | None:
+    if os.environ.get("RC_CHUNK_CACHE", "").lower() in ("0", "off", "false", "no"):
+        return None
+    base = os.environ.get("RC_CHUNK_CACHE_DIR")
+    return Path(base) if base else Path.home() / ".readingcopilot" / "chunk_cache"
+
+
+def _content_hash(pdf_path: str) -> str:
+    st = os.stat(pdf_path)
+    memo_key = (os.path.abspath(pdf_path), st.st_mtime_ns, st.st_size)
+    digest = _HASH_MEMO.get(memo_key)
+    if digest is None:
+        h = blake2b(digest_size=16)
+        with open(pdf_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        _HASH_MEMO[memo_key] = digest
+    return digest
+
+
+def _chunk_cache_path(pdf_path: str, max_chars: int, merge_distance: float, invert_y: bool) -> Path | None:
+    base = _chunk_cache_dir()
+    if base is None:
+        return None
+    try:
+        digest = _content_hash(pdf_path)
+    except OSError:
+        return None
+    params = f"{CHUNK_CACHE_VERSION}|{_pdf_backend()}|{max_chars}|{merge_distance}|{invert_y}"
+    return base / f"{digest}_{blake2b(params.encode(), digest_size=6).hexdigest()}.pkl"
+
 
 def extract_chunks(pdf_path: str, max_chars: int = 1200, merge_distance: float = 12.0, invert_y: bool = True) -> List[TextChunk]:
-    """Extract textual chunks with approximate bounding boxes at sentence granularity.
+    """Extract textual chunks, served from the on-disk chunk cache when possible.
+
+    See chunks_from_lines for the chunking strategy; iter_chunks streams the same result.
+    """
+    return list(iter_chunks(pdf_path, max_chars, merge_distance, invert_y))
+
+
+def iter_chunks(pdf_path: str, max_chars: int = 1200, merge_distance: float = 12.0, invert_y: bool = True) -> Iterator[TextChunk]:
+    """Yield chunks as soon as their paragraph is complete, page by page.
+
+    Lets callers pipeline work per page instead of waiting for the whole PDF. A fully
+    consumed run is written to the chunk cache; a cache hit yields the stored chunks.
+    """
+    cache_path = _chunk_cache_path(pdf_path, max_chars, merge_distance, invert_y)
+    if cache_path is not None:
+        try:
+            with open(cache_path, "rb") as f:
+                rows = pickle.load(f)
+        except Exception:
+            rows = None  # miss or unreadable entry; rebuild below
+        if rows is not None:
+            for row in rows:
+                yield TextChunk(*row)
+            return
+    chunks: List[TextChunk] = []
+    for chunk in iter_chunks_from_lines(iter_lines_with_bbox(pdf_path), max_chars, merge_distance, invert_y):
+        chunks.append(chunk)
+        yield chunk
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump([(c.id, c.page_index, c.text, c.rects, c.char_count, c.word_count) for c in chunks],
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass  # cache is best-effort
+
+
+def chunks_from_lines(lines: Iterable[Line], max_chars: int = 1200, merge_distance: float = 12.0, invert_y: bool = True) -> List[TextChunk]:
+    return list(iter_chunks_from_lines(lines, max_chars, merge_distance, invert_y))
+
+
+def iter_chunks_from_lines(lines: Iterable[Line], max_chars: int = 1200, merge_distance: float = 12.0, invert_y: bool = True) -> Iterator[TextChunk]:
+    """Build textual chunks with approximate bounding boxes at sentence granularity.
+
+    `lines` is what iter_lines_with_bbox yields (in page order); callers that already
+    hold a document's lines (PDFDocument) can chunk them without re-parsing the PDF.
 
     Strategy:
       1. Collect lines with geometry.
       2. Form 'paragraph buffers' separated by vertical gaps (> merge_distance) OR blank lines.
       3. Within each paragraph buffer, split text into sentences.
       4. Accumulate sentences into chunks without exceeding max_chars; never cut a sentence or word mid-unit.
-      5. Rect list for a chunk = union of the paragraph's line rects (coarse but stable).
+      5. Rect list for a chunk = the paragraph's line rects, merged into one box per column run (coarse but stable).
     """
-    chunks: List[TextChunk] = []
+    chunks: List[TextChunk] = []  # completed by flush_paragraph, handed out after each line
     chunk_id = 0
-    reader = PdfReader(pdf_path)
-    page_heights: List[float] = []
-    for p in reader.pages:
-        mb = p.mediabox
-        h = float(mb.top) - float(mb.bottom)
-        page_heights.append(h)
+    page_index = 0
+    paragraph_lines: List[Tuple[str, Tuple[float, float, float, float]]] = []
+    last_bottom = None
 
-    for page_index, page_layout in enumerate(extract_pages(pdf_path)):
-        paragraph_lines: List[Tuple[str, Tuple[float, float, float, float]]] = []
-        last_bottom = None
-
-        def flush_paragraph():
-            nonlocal chunk_id  # we mutate chunk_id
-            nonlocal paragraph_lines  # just to be explicit (allowed since defined in enclosing function scope)
-            if not paragraph_lines:
-                return
-            para_text = "".join(l for l, _ in paragraph_lines)
-            sentences = split_into_sentences(para_text)
-            if not sentences:
-                paragraph_lines = []
-                return
-            line_rects = [r for _, r in paragraph_lines]
-            current_sent_parts: List[str] = []
-            current_rects: List[Tuple[float, float, float, float]] = []
-            current_chars = 0
-            for sent in sentences:
-                sent_len = len(sent)
-                if current_chars + sent_len > max_chars and current_chars > 0:
-                    chunks.append(TextChunk(
-                        id=chunk_id,
-                        page_index=page_index,
-                        text=" ".join(current_sent_parts).strip(),
-                        rects=current_rects.copy(),
-                        char_count=current_chars
-                    ))
-                    chunk_id += 1
-                    current_sent_parts = []
-                    current_rects = []
-                    current_chars = 0
-                current_sent_parts.append(sent)
-                for r in line_rects:
-                    if r not in current_rects:
-                        current_rects.append(r)
-                current_chars += sent_len
-            if current_chars > 0:
+    def flush_paragraph():
+        nonlocal chunk_id  # we mutate chunk_id
+        nonlocal paragraph_lines  # just to be explicit (allowed since defined in enclosing function scope)
+        if not paragraph_lines:
+            return
+        para_text = "".join(l for l, _ in paragraph_lines)
+        sentences = split_into_sentences(para_text)
+        if not sentences:
+            paragraph_lines = []
+            return
+        # Every chunk of a paragraph carries the paragraph's line rects, merged per column run
+        paragraph_rects = merge_line_rects(list(dict.fromkeys(r for _, r in paragraph_lines)))
+        current_sent_parts: List[str] = []
+        current_chars = 0
+        for sent in sentences:
+            sent_len = len(sent)
+            if current_chars + sent_len > max_chars and current_chars > 0:
                 chunks.append(TextChunk(
                     id=chunk_id,
                     page_index=page_index,
                     text=" ".join(current_sent_parts).strip(),
-                    rects=current_rects.copy(),
+                    rects=paragraph_rects.copy(),
                     char_count=current_chars
                 ))
                 chunk_id += 1
-            paragraph_lines = []
+                current_sent_parts = []
+                current_chars = 0
+            current_sent_parts.append(sent)
+            current_chars += sent_len
+        if current_chars > 0:
+            chunks.append(TextChunk(
+                id=chunk_id,
+                page_index=page_index,
+                text=" ".join(current_sent_parts).strip(),
+                rects=paragraph_rects,  # last chunk of the paragraph takes the list itself
+                char_count=current_chars
+            ))
+            chunk_id += 1
+        paragraph_lines = []
 
-        for line in _iter_text_lines(page_layout):
-            raw_line = line.get_text()
-            if not raw_line.strip():
-                flush_paragraph()
-                continue
-            x0, y0, x1, y1 = line.bbox
-            if invert_y:
-                page_h = page_heights[page_index]
-                new_y0 = page_h - y1
-                new_y1 = page_h - y0
-                y0, y1 = new_y0, new_y1
-            if last_bottom is not None and (y0 > last_bottom + merge_distance):
-                flush_paragraph()
-            paragraph_lines.append((raw_line, (x0, y0, x1, y1)))
-            last_bottom = y0
-        flush_paragraph()
-    return chunks
+    for line_page, page_h, raw_line, (x0, y0, x1, y1) in lines:
+        if line_page != page_index:
+            # paragraphs never span pages
+            flush_paragraph()
+            page_index = line_page
+            last_bottom = None
+        if not raw_line.strip():
+            flush_paragraph()
+            if chunks:
+                yield from chunks
+                chunks.clear()
+            continue
+        if invert_y:
+            y0, y1 = page_h - y1, page_h - y0
+        if last_bottom is not None and (y0 > last_bottom + merge_distance):
+            flush_paragraph()
+        paragraph_lines.append((raw_line, (x0, y0, x1, y1)))
+        last_bottom = y0
+        if chunks:
+            yield from chunks
+            chunks.clear()
+    flush_paragraph()
+    yield from chunks
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import Optional
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QTextEdit, QLabel
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer
 from readingcopilot.core.annotations import Highlight, AnnotationDocument
 from readingcopilot.core.keywords import extract_keywords
 
@@ -12,6 +12,12 @@ class AnnotationPanel(QWidget):
         super().__init__(parent)
         self.doc: Optional[AnnotationDocument] = None
         self._current: Optional[Highlight] = None
+        self._current_item: Optional[QListWidgetItem] = None
+        # Note edits are committed once typing pauses, not on every keystroke
+        self._note_debounce = QTimer(self)
+        self._note_debounce.setSingleShot(True)
+        self._note_debounce.setInterval(250)
+        self._note_debounce.timeout.connect(self._commit_note)
 
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel("Highlights"))
@@ -29,27 +35,46 @@ class AnnotationPanel(QWidget):
         self.refresh_list()
 
     def refresh_list(self):
-        self.list_widget.clear()
-        if not self.doc:
-            return
-        # ensure highlights are in a stable, sorted order by page index
-        self.doc.highlights = sorted(self.doc.highlights, key=lambda hl: hl.page_index)
-        for hl in self.doc.highlights:
-            # Populate missing notes (e.g., legacy saved highlights) using heuristic keywords
-            if (not hl.note) and hl.extracted_text:
-                kw = extract_keywords(hl.extracted_text, max_keywords=4)
-                if kw:
-                    hl.note = "; ".join(kw)
-            item = QListWidgetItem(f"Page {hl.page_index+1} - {hl.note[:30] if hl.note else 'No note'}")
-            item.setData(Qt.ItemDataRole.UserRole, hl)
-            self.list_widget.addItem(item)
+        self.flush_pending_note()  # the edited row is about to be deleted
+        self._current_item = None
+        lw = self.list_widget
+        # One repaint and no per-item signals for the whole rebuild
+        lw.setUpdatesEnabled(False)
+        lw.blockSignals(True)
+        try:
+            lw.clear()
+            if not self.doc:
+                return
+            hls = self.sort_document()
+            for hl in hls:
+                # Populate missing notes (e.g., legacy saved highlights) using heuristic keywords
+                if (not hl.note) and hl.extracted_text:
+                    kw = extract_keywords(hl.extracted_text, max_keywords=4)
+                    if kw:
+                        hl.note = "; ".join(kw)
+                item = QListWidgetItem(hl.display_label())
+                item.setData(Qt.ItemDataRole.UserRole, hl)
+                lw.addItem(item)
+        finally:
+            lw.blockSignals(False)
+            lw.setUpdatesEnabled(True)
+
+    def sort_document(self) -> list[Highlight]:
+        """Put the document's highlights in the list's stable page order (re-sort only when out of order).
+
+        add_highlight/add_highlights keep the rows in this order already, so after
+        incremental inserts this replaces a full refresh_list().
+        """
+        hls = self.doc.highlights if self.doc else []
+        if any(a.page_index > b.page_index for a, b in zip(hls, hls[1:])):
+            self.doc.highlights = hls = sorted(hls, key=lambda hl: hl.page_index)
+        return hls
 
     def add_highlight(self, hl: Highlight):
         if not self.doc:
             return
         # Insert maintaining sort by page_index
-        display = f"Page {hl.page_index+1} - {hl.note[:30] if hl.note else 'No note'}"
-        item = QListWidgetItem(display)
+        item = QListWidgetItem(hl.display_label())
         item.setData(Qt.ItemDataRole.UserRole, hl)
         inserted = False
         for row in range(self.list_widget.count()):
@@ -62,11 +87,35 @@ class AnnotationPanel(QWidget):
         if not inserted:
             self.list_widget.addItem(item)
 
+    def add_highlights(self, highlights: list[Highlight]):
+        """Insert several highlights with a single list repaint and one pass over the rows."""
+        if not self.doc or not highlights:
+            return
+        lw = self.list_widget
+        role = Qt.ItemDataRole.UserRole
+        lw.setUpdatesEnabled(False)
+        try:
+            row, count = 0, lw.count()
+            # Merge into the page-sorted list; each insert resumes the scan where the last stopped
+            for hl in sorted(highlights, key=lambda h: h.page_index):
+                while row < count and lw.item(row).data(role).page_index <= hl.page_index:
+                    row += 1
+                item = QListWidgetItem(hl.display_label())
+                item.setData(role, hl)
+                lw.insertItem(row, item)
+                row += 1
+                count += 1
+        finally:
+            lw.setUpdatesEnabled(True)
+
     def _on_item_changed(self, current: QListWidgetItem, previous: QListWidgetItem):
+        self.flush_pending_note()  # belongs to the previously selected highlight
         if current is None:
+            self._current_item = None
             return
         hl = current.data(Qt.ItemDataRole.UserRole)
         self._current = hl
+        self._current_item = current
         self.note_edit.blockSignals(True)
         self.note_edit.setPlainText(hl.note or "")
         self.note_edit.blockSignals(False)
@@ -74,5 +123,18 @@ class AnnotationPanel(QWidget):
 
     def _on_note_changed(self):
         if self._current:
-            self._current.update_note(self.note_edit.toPlainText())
-            self.refresh_list()
+            self._note_debounce.start()  # restart; commits 250 ms after the last keystroke
+
+    def flush_pending_note(self):
+        """Commit a debounced note edit now (e.g. before saving or switching highlights)."""
+        if self._note_debounce.isActive():
+            self._note_debounce.stop()
+            self._commit_note()
+
+    def _commit_note(self):
+        if not self._current:
+            return
+        self._current.update_note(self.note_edit.toPlainText())
+        # Only the edited row's label changes; no list rebuild or re-sort
+        if self._current_item is not None:
+            self._current_item.setText(self._current.display_label())
@@ -1,30 +1,124 @@
 from __future__ import annotations
 import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QFileDialog, QWidget, QHBoxLayout, QSplitter,
-    QMessageBox, QToolBar, QProgressDialog, QLineEdit, QLabel, QStatusBar, QInputDialog
+    QMessageBox, QToolBar, QLineEdit, QLabel, QStatusBar, QInputDialog
 )
 from PySide6.QtGui import QAction, QKeySequence, QIcon
-from PySide6.QtCore import Qt, QSize, QThread, Signal, QObject, QTimer
+from PySide6.QtCore import Qt, QSize, QSettings, QThread, QThreadPool, Signal, QObject, QTimer
 
-from readingcopilot.core.annotations import AnnotationDocument, Highlight
-from readingcopilot.core.llm_client import build_llm_client
-from readingcopilot.core.llm_highlight import LLMHighlighter
-from readingcopilot.ui.profile_dialog import ProfileDialog
+from readingcopilot.core import jsonio
+from readingcopilot.core.annotations import AnnotationDocument, Highlight, write_text_atomic
+# LLM client/highlighter and the profile dialog are imported on first use: they pull in
+# requests, pypdf and pdfminer, which the plain viewing path never needs
 from readingcopilot.ui.pdf_viewer import PDFViewer
 from readingcopilot.ui.annotation_panel import AnnotationPanel
 
+_ICON_DIR = Path(__file__).parent / 'icons'
+
+@lru_cache(maxsize=None)
+def _icon_files() -> frozenset[str]:
+    # One directory listing for the whole toolbar instead of a stat per icon
+    try:
+        return frozenset(p.name for p in _ICON_DIR.iterdir())
+    except OSError:
+        return frozenset()
+
+@lru_cache(maxsize=None)
+def _load_icon(name: str) -> QIcon:
+    # Shared per name: each QIcon(path) stats and parses the SVG
+    fname = f"{name}.svg"
+    return QIcon(str(_ICON_DIR / fname)) if fname in _icon_files() else QIcon()
+
+@lru_cache(maxsize=None)
+def _load_stylesheet(name: str = 'style') -> str:
+    """QSS text of ui/<name>.qss ('' if missing); keyed by name so theme variants can share it."""
+    p = Path(__file__).parent / f"{name}.qss"
+    try:
+        return p.read_text(encoding='utf-8')
+    except OSError:
+        return ''
+
+class _AnnotationSaver:
+    """Writes annotation files on a pool thread so saves don't stall the UI.
+
+    The JSON is serialized on the calling (GUI) thread, which owns the document, so
+    each write is a consistent snapshot. Saves queued while a write is in progress
+    coalesce per path: only the newest snapshot is written.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[str, str] = {}  # path -> newest JSON not yet written
+        self._errors: dict[str, Exception] = {}
+        self._running = False
+        self._idle = threading.Event()
+        self._idle.set()
+
+    def save(self, doc: AnnotationDocument, wait: bool = False):
+        """Queue `doc` for writing; with wait=True block until written and re-raise failures."""
+        path = doc._default_annotations_path()
+        data = doc.to_json()
+        with self._lock:
+            self._pending[path] = data
+            self._errors.pop(path, None)
+            start = not self._running
+            if start:
+                self._running = True
+                self._idle.clear()
+        if start:
+            QThreadPool.globalInstance().start(self._drain)
+        if wait:
+            self._idle.wait()
+            with self._lock:
+                err = self._errors.pop(path, None)
+            if err is not None:
+                raise err
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    self._idle.set()
+                    return
+                path, data = self._pending.popitem()
+            try:
+                write_text_atomic(path, data)
+            except Exception as e:
+                with self._lock:
+                    self._errors[path] = e
+
 class MainWindow(QMainWindow):
+    _sessionLoaded = Signal(str, object)  # pdf path, AnnotationDocument (emitted from a pool thread)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("ReadingCopilot - PDF Annotator")
         self.resize(1200, 900)
         self._llm_client = None  # lazy init
         self._suppress_page_signal = False
-        self._state_path = self._state_file_path()
+        self._settings = QSettings("ReadingCopilot", "ReadingCopilot")  # native store; writes are atomic
+        self._last_persisted_pdf: str | None = None  # what the settings currently hold
+        self._saver = _AnnotationSaver()
         self._stream_thread: QThread | None = None
         self._active_stream_worker: 'LLMStreamWorker' | None = None
+        self._stream_seen: set[tuple] = set()  # (page_index, extracted_text) already in the doc during a run
+        # Streamed highlights are drawn in batches: one repaint per flush, not per highlight
+        self._stream_pending: list[Highlight] = []
+        self._stream_flush_timer = QTimer(self)
+        self._stream_flush_timer.setSingleShot(True)
+        self._stream_flush_timer.setInterval(50)
+        self._stream_flush_timer.timeout.connect(self._flush_stream_highlights)
+        # Background saves (after a run, after clearing) are debounced: serializing the
+        # whole document once 500 ms after the last change instead of once per change
+        self._save_doc: AnnotationDocument | None = None
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._flush_save)
         self._spinner_timer: QTimer | None = None
         self._spinner_label: QLabel | None = None
         self._spinner_frames = ["⠋","⠙","⠸","⠴","⠦","⠇"]
@@ -58,6 +152,7 @@ class MainWindow(QMainWindow):
         self.toolbar_page_label = None
 
         # Attempt to auto-load last session PDF
+        self._sessionLoaded.connect(self._on_session_loaded)
         self._load_last_session_pdf()
 
     def _create_toolbar(self):
@@ -66,14 +161,8 @@ class MainWindow(QMainWindow):
         tb.setMovable(False)
         self.addToolBar(tb)
 
-        icon_dir = Path(__file__).parent / 'icons'
-
-        def _icon(name: str) -> QIcon:
-            p = icon_dir / f"{name}.svg"
-            return QIcon(str(p)) if p.exists() else QIcon()
-
         def add_action(text: str, slot, icon_name: str | None = None, obj_name: str | None = None):
-            act = QAction(_icon(icon_name) if icon_name else QIcon(), text, self)
+            act = QAction(_load_icon(icon_name) if icon_name else QIcon(), text, self)
             if obj_name:
                 # Will map to a QToolButton via toolbar; setData cannot style so we rely on text matching via stylesheet classes if needed.
                 pass
@@ -85,17 +174,13 @@ class MainWindow(QMainWindow):
         save_act = add_action("Save", self.save_annotations, "save")
         profile_act = add_action("Profile", self.edit_profile, "profile")
         llm_act = add_action("LLM HL", self.llm_auto_highlight, "llm")
-        # Attach right-click (context menu) for page-range highlighting
-        def _configure_llm_btn():
-            btn = tb.widgetForAction(llm_act)
-            if not btn:
-                return
+        # Attach right-click (context menu) for page-range highlighting; QToolBar creates
+        # the button inside addAction, so it can be configured right away
+        btn = tb.widgetForAction(llm_act)
+        if btn:
             btn.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
             btn.customContextMenuRequested.connect(lambda _: self._prompt_llm_page_range())
             btn.setToolTip("Left-click: highlight whole doc. Right-click: highlight specific page range.")
-        # Defer configuration to ensure action widget exists
-        from PySide6.QtCore import QTimer
-        QTimer.singleShot(0, _configure_llm_btn)
         clear_act = add_action("Clear HLs", self.clear_all_highlights, "clear")
         clear_act.setToolTip("Remove all highlights (manual + auto)")
         # Cancel action (hidden until a run starts)
@@ -129,7 +214,8 @@ class MainWindow(QMainWindow):
         if not self.viewer.annotation_doc:
             QMessageBox.information(self, "Nothing to Save", "Load a PDF and create annotations first.")
             return
-        self.viewer.annotation_doc.save()
+        self.panel.flush_pending_note()
+        self._save_now(self.viewer.annotation_doc)
         QMessageBox.information(self, "Saved", "Annotations saved.")
 
     def _focus_highlight(self, hl):
@@ -141,21 +227,20 @@ class MainWindow(QMainWindow):
                 r = hl.rects[0].normalize()
                 zoom = self.viewer._zoom
                 y_offset = self.viewer._page_offsets.get(hl.page_index, 0.0)
-                self.viewer.centerOn(r.x1 * zoom, r.y1 * zoom + y_offset)
+                self.viewer.center_on_if_hidden(r.x1 * zoom, r.y1 * zoom + y_offset)
             if hl.page_index != self.viewer._page_index:
                 self.viewer._page_index = hl.page_index
                 self._update_page_label(self.viewer._page_index)
         else:
             if hl.page_index != self.viewer._page_index:
                 self.viewer._page_index = hl.page_index
-                self.viewer._render_single_page()
+                self.viewer._render_single_page()  # clears the scene, highlight items included
                 # redraw highlights only for this page
-                self.viewer.clear_highlight_items()
                 self.viewer._restore_highlights()
             if hl.rects:
                 r = hl.rects[0].normalize()
                 zoom = self.viewer._zoom
-                self.viewer.centerOn(r.x1 * zoom, r.y1 * zoom)
+                self.viewer.center_on_if_hidden(r.x1 * zoom, r.y1 * zoom)
             self._update_page_label(self.viewer._page_index)
 
     # ---- AI Integration ----
@@ -164,21 +249,21 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "No PDF", "Open a PDF first.")
             return
         doc = self.viewer.annotation_doc
+        from readingcopilot.ui.profile_dialog import ProfileDialog
         dlg = ProfileDialog(self, global_profile=doc.global_profile or "", document_goal=doc.document_goal or "", density=doc.highlight_density_target)
         if dlg.exec() == ProfileDialog.DialogCode.Accepted:
             doc.global_profile = dlg.global_profile()
             doc.document_goal = dlg.document_goal()
             doc.highlight_density_target = max(0.01, min(0.5, dlg.density()))
             # create snapshot context
-            import json
-            doc.profile_context = json.dumps({
+            doc.profile_context = jsonio.dumps_str({
                 "global_profile": doc.global_profile,
                 "document_goal": doc.document_goal,
                 "density": doc.highlight_density_target,
             })
             # Persist immediately
             try:
-                doc.save()
+                self._save_now(doc)
             except Exception as e:
                 QMessageBox.warning(self, "Save Error", f"Failed to save profile changes: {e}")
             QMessageBox.information(self, "Profile Saved", "Profile & goal updated (auto-saved).")
@@ -189,25 +274,33 @@ class MainWindow(QMainWindow):
         if self._llm_client is not None:
             return
         try:
+            from readingcopilot.core.llm_client import build_llm_client
             self._llm_client = build_llm_client()
         except Exception as e:
             QMessageBox.critical(self, "LLM Init Failed", f"Azure client initialization failed: {e}")
             self._llm_client = None
 
-    def llm_auto_highlight(self):
+    def _llm_run_preflight(self) -> AnnotationDocument | None:
+        """Checks shared by every LLM run entry point; returns the document or None (user informed)."""
         if self._active_stream_worker:
             QMessageBox.information(self, "In Progress", "Highlight generation already running.")
-            return
+            return None
         if not self.viewer.annotation_doc or not self.viewer._pdf:
             QMessageBox.information(self, "No PDF", "Open a PDF first.")
-            return
+            return None
         doc = self.viewer.annotation_doc
         if not (doc.global_profile and doc.document_goal):
             QMessageBox.information(self, "Profile Needed", "Set profile and document goal first (AI > Edit Profile / Goal).")
-            return
+            return None
         self._init_llm_client()
         if self._llm_client is None:
             QMessageBox.warning(self, "LLM Error", "Could not initialize LLM client.")
+            return None
+        return doc
+
+    def llm_auto_highlight(self):
+        doc = self._llm_run_preflight()
+        if doc is None:
             return
         density = max(0.01, min(0.5, doc.highlight_density_target))
         self._start_spinner("Analyzing")
@@ -215,8 +308,9 @@ class MainWindow(QMainWindow):
 
     def _prompt_llm_page_range(self):
         """Prompt user for a page range and run LLM highlighting on that subset."""
-        if not self.viewer.annotation_doc or not self.viewer._pdf:
-            QMessageBox.information(self, "No PDF", "Open a PDF first.")
+        # Check before prompting so the user never types a range that will be refused
+        doc = self._llm_run_preflight()
+        if doc is None:
             return
         total = self.viewer._pdf.page_count()
         text, ok = QInputDialog.getText(self, "LLM Highlight Page Range", f"Enter pages (1-{total}) e.g. 3-6,9,12-13:")
@@ -230,19 +324,7 @@ class MainWindow(QMainWindow):
         if not page_set:
             QMessageBox.information(self, "No Pages", "No valid pages selected.")
             return
-        # Proceed with filtered generation
-        doc = self.viewer.annotation_doc
-        if not (doc.global_profile and doc.document_goal):
-            QMessageBox.information(self, "Profile Needed", "Set profile and document goal first (AI > Edit Profile / Goal).")
-            return
-        self._init_llm_client()
-        if self._llm_client is None:
-            QMessageBox.warning(self, "LLM Error", "Could not initialize LLM client.")
-            return
         density = max(0.01, min(0.5, doc.highlight_density_target))
-        if self._active_stream_worker:
-            QMessageBox.information(self, "In Progress", "Another highlight generation is running.")
-            return
         self._start_spinner("Analyzing")
         self._start_stream_worker(pdf_path=doc.pdf_path, density=density, page_filter=page_set)
 
@@ -269,8 +351,7 @@ class MainWindow(QMainWindow):
                     start, end = end, start
                 if start < 1 or end > total_pages:
                     raise ValueError(f"Range {start}-{end} out of bounds (1-{total_pages})")
-                for v in range(start, end+1):
-                    pages.add(v-1)
+                pages.update(range(start-1, end))
             else:
                 if not part.isdigit():
                     raise ValueError(f"Invalid page number: {part}")
@@ -296,6 +377,11 @@ class MainWindow(QMainWindow):
             return
         count = len(doc.highlights)
         doc.clear_highlights()
+        try:
+            doc.discard_journal()  # or the next load would replay the cleared highlights
+        except OSError:
+            pass
+        self._stream_seen.clear()
         # Re-render current page (remove overlay items)
         if self.viewer._pdf:
             if self.viewer.continuous_mode:
@@ -305,10 +391,7 @@ class MainWindow(QMainWindow):
             else:
                 self.viewer._render_single_page()
         self.panel.refresh_list()
-        try:
-            doc.save()
-        except Exception:
-            pass
+        self._schedule_save(doc)
         QMessageBox.information(self, "Cleared", f"Removed {count} highlights.")
 
     # ---- Spinner helpers ----
@@ -341,6 +424,7 @@ class MainWindow(QMainWindow):
         doc = self.viewer.annotation_doc
         if not doc:
             return
+        self._stream_seen = {(h.page_index, h.extracted_text) for h in doc.highlights}
         self._active_stream_worker = LLMStreamWorker(client=self._llm_client, annotation_doc=doc, pdf_path=pdf_path, density=density, page_filter=page_filter)
         self._stream_thread = QThread(self)
         self._active_stream_worker.moveToThread(self._stream_thread)
@@ -351,12 +435,19 @@ class MainWindow(QMainWindow):
         self._active_stream_worker.error.connect(self._on_stream_error)
         self._active_stream_worker.finished.connect(self._stream_thread.quit)
         self._active_stream_worker.finished.connect(self._active_stream_worker.deleteLater)
-        self._stream_thread.finished.connect(lambda: setattr(self, '_active_stream_worker', None))
+        # A failed run must release the thread too, or later runs report "already running"
+        self._active_stream_worker.error.connect(self._stream_thread.quit)
+        self._active_stream_worker.error.connect(self._active_stream_worker.deleteLater)
+        self._stream_thread.finished.connect(self._on_stream_thread_finished)
         self._stream_thread.finished.connect(self._stream_thread.deleteLater)
         self._stream_thread.start()
         if self._cancel_action:
             self._cancel_action.setVisible(True)
 
+    def _on_stream_thread_finished(self):
+        self._active_stream_worker = None
+        self._stream_thread = None  # deleteLater'd; never touch it after this
+
     def _cancel_stream(self):
         if self._active_stream_worker:
             self._active_stream_worker.request_cancel()
@@ -367,30 +458,47 @@ class MainWindow(QMainWindow):
                 self._cancel_action.setEnabled(False)
 
     def _on_stream_highlight(self, hl: Highlight):
+        self._stream_pending.append(hl)
+        if not self._stream_flush_timer.isActive():
+            self._stream_flush_timer.start()
+
+    def _flush_stream_highlights(self):
+        self._stream_flush_timer.stop()
+        pending, self._stream_pending = self._stream_pending, []
         doc = self.viewer.annotation_doc
-        if not doc:
+        if not doc or not pending:
             return
-        # Avoid duplicates from earlier manual/auto runs
-        if any((existing.extracted_text == hl.extracted_text and existing.page_index == hl.page_index) for existing in doc.highlights):
-            return
-        doc.add_highlight(hl)
-        if self.viewer.continuous_mode or hl.page_index == self.viewer._page_index:
-            self.viewer._draw_highlight(hl)
-        # Insert into panel (maintain order later via refresh or smarter insertion)
-        self.panel.add_highlight(hl)
+        seen = self._stream_seen
+        mark_seen = seen.add
+        added: list[Highlight] = []
+        keep = added.append
+        for hl in pending:
+            # Avoid duplicates from earlier manual/auto runs (set lookup; built once per run)
+            key = (hl.page_index, hl.extracted_text)
+            if key not in seen:
+                mark_seen(key)
+                keep(hl)
+        doc.add_highlights(added)
+        try:
+            doc.append_to_journal(added)  # O(new) instead of rewriting the whole file
+        except OSError:
+            self._schedule_save(doc)
+        if self.viewer.continuous_mode:
+            self.viewer.draw_highlights(added)
+        else:
+            current = self.viewer._page_index
+            self.viewer.draw_highlights([hl for hl in added if hl.page_index == current])
+        # Merged into the panel in page order; the document list is sorted when the run ends
+        self.panel.add_highlights(added)
 
     def _on_stream_finished(self, log_path: str | None, count: int, page_filter: str, cancelled: bool):
+        self._flush_stream_highlights()
         self._stop_spinner()
         if self._cancel_action:
             self._cancel_action.setVisible(False)
             self._cancel_action.setEnabled(True)
-        self.panel.refresh_list()
-        doc = self.viewer.annotation_doc
-        if doc:
-            try:
-                doc.save()
-            except Exception:
-                pass
+        self.panel.sort_document()  # rows were inserted as highlights streamed in; no rebuild needed
+        # New highlights are already in the journal; the next full save folds them in
         suffix = f"\nLog saved to: {log_path}" if log_path else ""
         scope = f" for pages {page_filter}" if page_filter else ""
         if cancelled:
@@ -399,7 +507,11 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "LLM Highlight", f"Added {count} new highlights{scope}.{suffix}")
 
     def _on_stream_error(self, message: str):
+        self._flush_stream_highlights()  # keep what was scored before the failure
         self._stop_spinner()
+        if self._cancel_action:
+            self._cancel_action.setVisible(False)
+            self._cancel_action.setEnabled(True)
         QMessageBox.critical(self, "LLM Error", message)
 
     def _on_stream_page_progress(self, page_index: int):
@@ -423,40 +535,92 @@ class MainWindow(QMainWindow):
             self.toolbar_page_label.setText(f"{page_index+1} / {total}")
 
     # ---- Persistence helpers ----
-    def _state_file_path(self) -> str:
-        from pathlib import Path as _P
-        base = _P.home() / ".readingcopilot"
-        base.mkdir(exist_ok=True)
-        return str(base / "app_state.json")
+    def _schedule_save(self, doc: AnnotationDocument):
+        """Save `doc` in the background once no further save is requested for 500 ms."""
+        if self._save_doc is not None and self._save_doc is not doc:
+            self._flush_save()
+        self._save_doc = doc
+        self._save_timer.start()
+
+    def _flush_save(self, wait: bool = False):
+        """Write the scheduled save now, if any; failures are ignored as before."""
+        self._save_timer.stop()
+        doc, self._save_doc = self._save_doc, None
+        if doc is None:
+            return
+        try:
+            self._saver.save(doc, wait=wait)
+        except Exception:
+            pass
+
+    def _save_now(self, doc: AnnotationDocument):
+        """Write `doc` and wait, superseding a scheduled save of it; re-raises failures."""
+        if self._save_doc is doc:
+            self._save_timer.stop()
+            self._save_doc = None
+        else:
+            self._flush_save()
+        self._saver.save(doc, wait=True)
+        doc.discard_journal()  # compacted: the file just written holds every journaled highlight
 
     def _persist_last_pdf(self, pdf_path: str):
-        import json
-        state = {"last_pdf": pdf_path}
+        if pdf_path == self._last_persisted_pdf:
+            return
+        self._settings.setValue("last_pdf", pdf_path)  # flushed to disk by Qt, off the hot path
+        self._last_persisted_pdf = pdf_path
+
+    def _legacy_last_pdf(self) -> str | None:
+        """last_pdf from the pre-QSettings ~/.readingcopilot/app_state.json, if present."""
         try:
-            with open(self._state_path, 'w', encoding='utf-8') as f:
-                json.dump(state, f)
+            return jsonio.loads((Path.home() / ".readingcopilot" / "app_state.json").read_bytes()).get("last_pdf")
         except Exception:
-            pass
+            return None
 
     def _load_last_session_pdf(self):
-        import json
+        """Reopen the last PDF. Its annotation file is parsed on a pool thread so the
+        window paints first; the viewer is filled in by _on_session_loaded."""
         try:
-            with open(self._state_path, 'r', encoding='utf-8') as f:
-                state = json.load(f)
-            last_pdf = state.get("last_pdf")
+            last_pdf = self._settings.value("last_pdf", "", type=str) or None
+            self._last_persisted_pdf = last_pdf
+            last_pdf = last_pdf or self._legacy_last_pdf()
             if last_pdf and Path(last_pdf).exists():
-                ann = AnnotationDocument.load(last_pdf)
-                self.viewer.load_pdf(last_pdf, annotations=ann)
-                self.panel.set_document(ann)
-                self._update_page_label(self.viewer._page_index)
+                QThreadPool.globalInstance().start(lambda: self._read_session_annotations(last_pdf))
+        except Exception:
+            pass
+
+    def _read_session_annotations(self, pdf_path: str):  # runs on a pool thread
+        try:
+            ann = AnnotationDocument.load(pdf_path)
+            self._sessionLoaded.emit(pdf_path, ann)  # queued to the GUI thread
+        except Exception:
+            pass
+
+    def _on_session_loaded(self, pdf_path: str, ann: AnnotationDocument):
+        if self.viewer._pdf is not None:
+            return  # the user opened a file in the meantime
+        try:
+            self.viewer.load_pdf(pdf_path, annotations=ann)
+            self.panel.set_document(ann)
+            self._update_page_label(self.viewer._page_index)
         except Exception:
             pass
 
     def closeEvent(self, event):  # noqa: N802
+        # A running LLM thread must finish before its QThread is destroyed; cancel it and
+        # wait (bounded: an in-flight request may still complete) instead of aborting
+        if self._active_stream_worker:
+            self._active_stream_worker.request_cancel()
+        if self._stream_thread is not None:
+            self._stream_thread.quit()  # the queued finished->quit can't run while we block here
+            self._stream_thread.wait(10000)
         # Save on exit
         try:
+            self._flush_stream_highlights()
+            self.panel.flush_pending_note()
             if self.viewer.annotation_doc:
-                self.viewer.annotation_doc.save()
+                self._save_now(self.viewer.annotation_doc)  # also drains queued saves
+            else:
+                self._flush_save(wait=True)
         except Exception:
             pass
         super().closeEvent(event)
@@ -482,7 +646,10 @@ class LLMStreamWorker(QObject):
 
     def run(self):  # executed in thread
         try:
-            highlighter = LLMHighlighter(self.client)
+            # Imported here so the first run's import cost stays off the GUI thread
+            from readingcopilot.core.llm_highlight import LLMHighlighter
+            from readingcopilot.core.score_cache import ScoreCache
+            highlighter = LLMHighlighter(self.client, score_cache=ScoreCache.default())
             emitted: list[Highlight] = []
             def _cb(hl: Highlight):
                 emitted.append(hl)
@@ -509,13 +676,9 @@ class LLMStreamWorker(QObject):
 def run():
     app = QApplication(sys.argv)
     # Apply global stylesheet
-    try:
-        style_path = Path(__file__).parent / 'style.qss'
-        if style_path.exists():
-            with open(style_path, 'r', encoding='utf-8') as f:
-                app.setStyleSheet(f.read())
-    except Exception:
-        pass
+    qss = _load_stylesheet()
+    if qss:
+        app.setStyleSheet(qss)
     win = MainWindow()
     win.show()
     sys.exit(app.exec())
@@ -1,23 +1,78 @@
 from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import os
 from typing import List, Callable, Optional, Dict, Tuple
 from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem, QGraphicsTextItem, QGraphicsPixmapItem, QLabel
 from PySide6.QtGui import QPixmap, QImage, QPen, QColor, QBrush, QMouseEvent, QPainter
-from PySide6.QtCore import Qt, QRectF, Signal, QPointF
+from PySide6.QtCore import Qt, QRectF, Signal, QPointF, QTimer, QObject, QRunnable, QThreadPool
 
 from readingcopilot.core.annotations import Rect, Highlight, AnnotationDocument
 from readingcopilot.core.pdf_loader import PDFDocument
 
-class HighlightGraphicsRect(QGraphicsRectItem):
-    def __init__(self, rect: QRectF, color: QColor):
-        super().__init__(rect)
-        self.setBrush(QBrush(color, Qt.BrushStyle.SolidPattern))
-        self.setPen(QPen(Qt.PenStyle.NoPen))
-        self.setOpacity(0.35)
+# Recently opened documents: reopening one skips parsing it again and keeps its
+# render/layout caches. Keyed by (path, mtime) so a changed file is reparsed.
+_PDF_CACHE_MAX = 3
+_PDF_CACHE: OrderedDict[Tuple[str, int], PDFDocument] = OrderedDict()
+
+def _open_pdf(path: str) -> PDFDocument:
+    path = os.path.abspath(path)
+    key = (path, os.stat(path).st_mtime_ns)
+    pdf = _PDF_CACHE.pop(key, None)
+    if pdf is None:
+        for stale in [k for k in _PDF_CACHE if k[0] == path]:
+            _PDF_CACHE.pop(stale).close()
+        pdf = PDFDocument(path)
+    _PDF_CACHE[key] = pdf
+    while len(_PDF_CACHE) > _PDF_CACHE_MAX:
+        _, evicted = _PDF_CACHE.popitem(last=False)
+        evicted.close()
+    return pdf
+
+class _RenderSignals(QObject):
+    rendered = Signal(object)  # the finished PageRenderTask; queued onto the GUI thread
+
+
+class PageRenderTask(QRunnable):
+    """Rasterize one page on a pool thread; the viewer swaps the pixmap in when it arrives."""
+    def __init__(self, pdf: PDFDocument, index: int, zoom: float, generation: int, signals: _RenderSignals,
+                 scale: float = 1.0):
+        super().__init__()
+        self.setAutoDelete(False)  # kept alive by the viewer until rendered is delivered
+        self.pdf = pdf
+        self.index = index
+        self.zoom = zoom  # layout zoom; the page is rasterized at zoom * scale
+        self.scale = scale  # < 1 for a low-resolution draft shown while scrolling
+        self.generation = generation
+        self.image: Optional[QImage] = None
+        self.error: Optional[str] = None
+        self._signals = signals
+
+    def run(self):
+        try:
+            self.image, _, _ = self.pdf.render_page(self.index, zoom=self.zoom * self.scale)
+        except RuntimeError as e:
+            self.error = str(e)
+        try:
+            self._signals.rendered.emit(self)
+        except RuntimeError:  # viewer already destroyed
+            pass
 
 class PDFViewer(QGraphicsView):
     highlightCreated = Signal(Highlight)
     pageChanged = Signal(int)
 
+    _PIXMAP_CACHE_MAX = 16  # recently shown pages; enough for a continuous-mode viewport and its margin
+    _PREFETCH_ORDER = (1, -1, 2, -2, 3)  # single-page mode: offsets from the current page, likeliest next read first
+    _PREFETCH_AHEAD = 2  # continuous mode: pages prefetched past the render margin in reading direction
+    _DRAFT_SCALE = 0.4  # while wheel-scrolling, pages entering view are rasterized at this fraction first
+    _HIGHLIGHT_PEN = QPen(Qt.PenStyle.NoPen)
+    _HIGHLIGHT_BRUSHES: Dict[Tuple[int, ...], QBrush] = {}  # color tuple -> brush, shared by all viewers
+    _PLACEHOLDER_PEN = QPen(QColor(220, 220, 220))
+    _PLACEHOLDER_BRUSH = QBrush(QColor(255, 255, 255))  # page area shown until its render arrives
+    _RUBBER_BAND_PEN = QPen(QColor(255, 215, 0))
+    _RUBBER_BAND_PEN.setStyle(Qt.PenStyle.DashLine)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setScene(QGraphicsScene(self))
@@ -26,8 +81,38 @@ class PDFViewer(QGraphicsView):
         self._scale: float = 1.0  # unused in current fixed zoom pipeline
         self._zoom: float = 1.3
         self._page_pixmap_item = None  # legacy single-page reference
+        self._page_placeholder: Optional[QGraphicsRectItem] = None  # single-page mode, reused across page turns
         self._page_items: List[Tuple[int, 'QGraphicsPixmapItem']] = []  # (page_index, item)
+        self._page_placeholders: List[QGraphicsRectItem] = []  # aligned with _page_items
+        self._layout_pdf: Optional[PDFDocument] = None  # document whose continuous layout is in the scene
+        self._render_signature: tuple = ()  # what the scene currently shows; see _render_document
+        self._page_pixmap_cache: OrderedDict[Tuple[int, float], QPixmap] = OrderedDict()  # (page_index, round(zoom, 3)) -> pixmap
         self._page_offsets: Dict[int, float] = {}  # page_index -> y offset (scene coords, unscaled already applied)
+        self._page_tops: List[float] = []  # continuous mode: y offset of every page, in page order
+        self._page_spans: List[Tuple[float, float]] = []  # (top, bottom) per _page_items entry, known before rendering
+        self._rendered_pages: Dict[int, QGraphicsPixmapItem] = {}  # continuous mode: items currently holding a pixmap
+        # page_index -> its highlight rect items; removed without walking every scene item.
+        # Continuous mode only holds pages currently in _rendered_pages.
+        self._hl_items_by_page: Dict[int, List[QGraphicsRectItem]] = {}
+        # Pages are rasterized on QThreadPool workers. _pending maps page -> task still wanted;
+        # results from an older generation (previous layout/document) are dropped on arrival.
+        self._pending: Dict[int, PageRenderTask] = {}
+        self._render_tasks: set = set()  # every submitted task until its result is delivered
+        self._render_generation = 0
+        self._render_signals = _RenderSignals(self)
+        self._render_signals.rendered.connect(self._on_page_rendered)
+        # Wheel scrolling shows drafts; once the wheel has been idle this long, shown drafts are re-rendered
+        self._fast_scroll = False
+        self._draft_pages: set = set()  # continuous mode: pages showing an upscaled draft pixmap
+        self._scroll_settle_timer = QTimer(self)
+        self._scroll_settle_timer.setSingleShot(True)
+        self._scroll_settle_timer.setInterval(150)
+        self._scroll_settle_timer.timeout.connect(self._render_visible_at_full_quality)
+        # Throttles the visible-page scan (and pageChanged) to one per interval while the wheel spins
+        self._visible_page_timer = QTimer(self)
+        self._visible_page_timer.setSingleShot(True)
+        self._visible_page_timer.setInterval(40)
+        self._visible_page_timer.timeout.connect(self._update_visible_page)
         self.continuous_mode: bool = True  # enable stacked pages with smooth scrolling
         self._drag_start: Optional[QPointF] = None
         self._rubber_band_rect: Optional[QGraphicsRectItem] = None
@@ -44,13 +129,24 @@ class PDFViewer(QGraphicsView):
         self._page_overlay.hide()
         # Update overlay whenever page changes
         self.pageChanged.connect(self._on_page_changed)
+        self.verticalScrollBar().valueChanged.connect(self._render_visible_pages)
+        # Neighbour prefetch starts once the event loop is idle again, so the page
+        # turn (or scroll) paints first and rapid flipping only prefetches around the last page.
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(30)
+        self._prefetch_timer.timeout.connect(self._prefetch_neighbours)
 
     def load_pdf(self, path: str, annotations: Optional[AnnotationDocument] = None):
-        if self._pdf:
-            self._pdf.close()
-        self._pdf = PDFDocument(path)
+        previous, self._pdf = self._pdf, _open_pdf(path)
+        if previous is not self._pdf:
+            if previous is not None:
+                previous.prefetch(())  # stays cached for a reopen; just drop its queued renders
+            self._page_pixmap_cache.clear()
+            self._cancel_renders(new_generation=True)
+            self._page_index = 0
+        # else: the same unchanged file again; keep its pages, place and in-flight renders
         self.annotation_doc = annotations or AnnotationDocument.load(path)
-        self._page_index = 0
         self._render_document()
         self._restore_highlights()
         self._update_page_overlay()
@@ -59,55 +155,279 @@ class PDFViewer(QGraphicsView):
         """Legacy single-page render (used if continuous_mode is False)."""
         if not self._pdf:
             return
-        try:
-            img, w, h = self._pdf.render_page(self._page_index, zoom=self._zoom)
-        except RuntimeError as e:
-            scene = self.scene(); scene.clear()
-            item = QGraphicsTextItem(str(e)); scene.addItem(item)
-            self.setSceneRect(QRectF(0, 0, 800, 600))
-            self.pageChanged.emit(self._page_index)
-            return
-        pix = QPixmap.fromImage(img)
-        scene = self.scene(); scene.clear()
-        self._page_pixmap_item = scene.addPixmap(pix)
-        self.setSceneRect(QRectF(0, 0, pix.width(), pix.height()))
+        pix = self._get_pixmap(self._page_index)
+        if pix is None:
+            try:
+                w, h = self._pdf.render_size(self._page_index, zoom=self._zoom)
+            except RuntimeError as e:
+                self._clear_scene()
+                item = QGraphicsTextItem(str(e)); self.scene().addItem(item)
+                self.setSceneRect(QRectF(0, 0, 800, 600))
+                self.pageChanged.emit(self._page_index)
+                return
+        else:
+            w, h = pix.width(), pix.height()
+        self._cancel_renders(keep=(self._page_index,))
+        item = self._page_pixmap_item
+        if item is None:
+            # First page shown since the scene was cleared; later page turns reuse these two items
+            self._clear_scene()
+            scene = self.scene()
+            self._page_placeholder = scene.addRect(0, 0, w, h, self._PLACEHOLDER_PEN, self._PLACEHOLDER_BRUSH)
+            item = self._page_pixmap_item = scene.addPixmap(QPixmap())
+        else:
+            self.clear_highlight_items()
+            for child in item.childItems():  # render error text from the previous page
+                self.scene().removeItem(child)
+            self._page_placeholder.setRect(0, 0, w, h)
+        self.setSceneRect(QRectF(0, 0, w, h))
+        if pix is not None:
+            item.setPixmap(pix)
+        else:
+            item.setPixmap(QPixmap())  # filled by _on_page_rendered
+            self._request_render(self._page_index)
+        self._prefetch_timer.start()
         self.pageChanged.emit(self._page_index)
 
+    def _clear_scene(self):
+        """Remove every scene item; the next render of either mode rebuilds its items."""
+        self.scene().clear()
+        self._hl_items_by_page.clear()
+        self._page_pixmap_item = self._page_placeholder = None
+        self._page_items.clear()
+        self._page_placeholders.clear()
+        self._rendered_pages.clear()
+        self._draft_pages.clear()
+        self._layout_pdf = None
+        self._render_signature = ()
+
+    def _get_pixmap(self, index: int) -> Optional[QPixmap]:
+        """Page pixmap at the current zoom if it needs no rendering (LRU or document cache), else None."""
+        key = (index, round(self._zoom, 3))
+        pix = self._page_pixmap_cache.get(key)
+        if pix is not None:
+            self._page_pixmap_cache.move_to_end(key)
+            return pix
+        img = self._pdf.cached_render(index, zoom=self._zoom)
+        return self._cache_pixmap(index, img) if img is not None else None
+
+    def _cache_pixmap(self, index: int, img: QImage) -> QPixmap:
+        pix = QPixmap.fromImage(img)
+        self._page_pixmap_cache[(index, round(self._zoom, 3))] = pix
+        if len(self._page_pixmap_cache) > self._PIXMAP_CACHE_MAX:
+            self._page_pixmap_cache.popitem(last=False)
+        return pix
+
+    def _prefetch_neighbours(self):
+        """Render the pages likely to be read next in the background (low-priority threads),
+        so page turns and scrolling into new pages hit the render cache."""
+        if not self._pdf:
+            return
+        if self.continuous_mode:
+            if not self._rendered_pages:
+                return
+            first, last = min(self._rendered_pages), max(self._rendered_pages)
+            order = [last + k for k in range(1, self._PREFETCH_AHEAD + 1)] + [first - 1]
+        else:
+            order = [self._page_index + k for k in self._PREFETCH_ORDER]
+        self._pdf.prefetch(order, self._zoom)
+
     def _render_all_pages(self):
+        """Lay out every page at its rendered size; pixmaps are filled in as pages near the viewport."""
         if not self._pdf:
             return
-        scene = self.scene(); scene.clear()
-        self._page_items.clear()
+        self._cancel_renders(new_generation=True)
+        if self._layout_pdf is self._pdf and len(self._page_items) == self._pdf.page_count():
+            self._relayout_pages()
+            return
+        self._clear_scene()
+        scene = self.scene()
         self._page_offsets.clear()
+        self._page_spans.clear()
         y_cursor = 0.0
         max_width = 0.0
-        for idx in range(self._pdf.page_count()):
-            try:
-                img, w, h = self._pdf.render_page(idx, zoom=self._zoom)
-            except RuntimeError as e:
-                # Represent missing page with placeholder text
+        try:
+            sizes = self._pdf.page_sizes(zoom=self._zoom)
+        except RuntimeError as e:
+            # Represent missing pages with placeholder text
+            for idx in range(self._pdf.page_count()):
                 placeholder = QGraphicsTextItem(f"Render error page {idx+1}: {e}")
                 placeholder.setPos(10, y_cursor + 10)
                 scene.addItem(placeholder)
                 self._page_offsets[idx] = y_cursor
                 y_cursor += 600  # arbitrary fallback height
-                continue
-            pix = QPixmap.fromImage(img)
-            item = scene.addPixmap(pix)
+            self._finish_layout(max_width, y_cursor)
+            return
+        for idx, (w, h) in enumerate(sizes):
+            self._page_placeholders.append(scene.addRect(0, y_cursor, w, h, self._PLACEHOLDER_PEN, self._PLACEHOLDER_BRUSH))
+            item = scene.addPixmap(QPixmap())  # pixmap set by _render_visible_pages
             item.setPos(0, y_cursor)
             self._page_offsets[idx] = y_cursor
+            self._page_spans.append((y_cursor, y_cursor + h))
             self._page_items.append((idx, item))
-            y_cursor += pix.height() + 20  # gap between pages
-            max_width = max(max_width, pix.width())
-        self.setSceneRect(QRectF(0, 0, max_width, y_cursor))
+            y_cursor += h + 20  # gap between pages
+            max_width = max(max_width, w)
+        self._layout_pdf = self._pdf
+        self._finish_layout(max_width, y_cursor)
+
+    def _relayout_pages(self):
+        """Same document again (reload or zoom change): move the existing page items into
+        place instead of clearing the scene and allocating them all again."""
+        self.clear_highlight_items()
+        for idx, item in self._rendered_pages.items():
+            self._release_page(idx, item)
+            for child in item.childItems():
+                self.scene().removeItem(child)
+        self._rendered_pages.clear()
+        self._page_offsets.clear()
+        self._page_spans.clear()
+        y_cursor = 0.0
+        max_width = 0.0
+        sizes = self._pdf.page_sizes(zoom=self._zoom)
+        for (idx, item), placeholder in zip(self._page_items, self._page_placeholders):
+            w, h = sizes[idx]
+            placeholder.setRect(0, y_cursor, w, h)
+            item.setPos(0, y_cursor)
+            self._page_offsets[idx] = y_cursor
+            self._page_spans.append((y_cursor, y_cursor + h))
+            y_cursor += h + 20
+            max_width = max(max_width, w)
+        self._finish_layout(max_width, y_cursor)
+
+    def _finish_layout(self, width: float, height: float):
+        self._page_tops = list(self._page_offsets.values())  # inserted in page order
+        self.setSceneRect(QRectF(0, 0, width, height))
+        self._render_visible_pages()
         self.pageChanged.emit(self._page_index)
         self._update_page_overlay()
 
-    def _render_document(self):
+    def _render_visible_pages(self, *_):
+        """Continuous mode: render pages within a viewport's height of the visible area and
+        release the pixmaps of pages further away, so memory stays bounded on long documents.
+        """
+        if not self._pdf or not self.continuous_mode or not self._page_items:
+            return
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        margin = visible.height()
+        top, bottom = visible.top() - margin, visible.bottom() + margin
+        # Pages are stacked, so the ones in range are a contiguous run found by bisection
+        spans = self._page_spans
+        lo = bisect_right(spans, top, key=lambda span: span[1])
+        hi = bisect_left(spans, bottom, key=lambda span: span[0])
+        near = {self._page_items[i][0]: self._page_items[i][1] for i in range(lo, hi)}
+        rendered = self._rendered_pages
+        hl_items = self._hl_items_by_page
+        remove_item = self.scene().removeItem
+        for idx in [idx for idx in rendered if idx not in near]:
+            self._release_page(idx, rendered.pop(idx))
+            for hl_item in hl_items.pop(idx, ()):
+                remove_item(hl_item)
+        self._cancel_renders(keep=near)
+        doc = self.annotation_doc
+        for idx, item in near.items():
+            if idx in rendered:
+                continue
+            rendered[idx] = item
+            if doc is not None:
+                self._add_highlight_items(doc.highlights_on_page(idx))
+            pix = self._get_pixmap(idx)
+            if pix is not None:
+                item.setPixmap(pix)
+            else:
+                self._request_render(idx, self._DRAFT_SCALE if self._fast_scroll else 1.0)
+        self._prefetch_timer.start()
+
+    def _release_page(self, idx: int, item: QGraphicsPixmapItem):
+        item.setPixmap(QPixmap())
+        if idx in self._draft_pages:
+            self._draft_pages.discard(idx)
+            item.setScale(1.0)
+
+    def _render_visible_at_full_quality(self):
+        """Scrolling settled: replace drafts (shown or still queued) with full-resolution renders."""
+        self._fast_scroll = False
+        for idx, item in self._rendered_pages.items():
+            task = self._pending.get(idx)
+            if idx not in self._draft_pages and (task is None or task.scale == 1.0):
+                continue
+            pix = self._get_pixmap(idx)
+            if pix is None:
+                self._request_render(idx)
+            else:
+                self._unqueue(idx)
+                self._show_page(idx, item, pix)
+
+    def _show_page(self, idx: int, item: QGraphicsPixmapItem, pix: QPixmap):
+        if idx in self._draft_pages:
+            self._draft_pages.discard(idx)
+            item.setScale(1.0)
+        item.setPixmap(pix)
+
+    def _request_render(self, idx: int, scale: float = 1.0):
+        task = self._pending.get(idx)
+        if task is not None:
+            if task.scale == scale:
+                return
+            self._unqueue(idx)
+        task = PageRenderTask(self._pdf, idx, self._zoom, self._render_generation, self._render_signals, scale)
+        self._pending[idx] = task
+        self._render_tasks.add(task)
+        QThreadPool.globalInstance().start(task)
+
+    def _cancel_renders(self, keep=(), new_generation: bool = False):
+        """Unqueue page renders not in `keep`; ones already running are ignored when they arrive."""
+        if new_generation:
+            self._render_generation += 1
+        for idx in [idx for idx in self._pending if new_generation or idx not in keep]:
+            self._unqueue(idx)
+
+    def _unqueue(self, idx: int):
+        """Forget the pending render of a page; if it is already running, its result is dropped."""
+        task = self._pending.pop(idx, None)
+        if task is not None and QThreadPool.globalInstance().tryTake(task):
+            self._render_tasks.discard(task)
+
+    def _on_page_rendered(self, task: PageRenderTask):
+        self._render_tasks.discard(task)
+        if (task.generation != self._render_generation or task.zoom != self._zoom
+                or self._pending.get(task.index) is not task):
+            return  # stale: the layout, document or visible range changed meanwhile
+        del self._pending[task.index]
         if self.continuous_mode:
-            self._render_all_pages()
+            item = self._rendered_pages.get(task.index)
         else:
-            self._render_single_page()
+            item = self._page_pixmap_item if task.index == self._page_index else None
+        if item is None:
+            return
+        if task.error is not None:
+            if not item.childItems():
+                QGraphicsTextItem(f"Render error page {task.index+1}: {task.error}", item).setPos(10, 10)
+            return
+        if task.scale != 1.0:
+            # Draft: drawn upscaled into the page's full-size slot until the crisp render replaces it
+            item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+            item.setPixmap(QPixmap.fromImage(task.image))
+            item.setScale(1.0 / task.scale)
+            self._draft_pages.add(task.index)
+            return
+        self._show_page(task.index, item, self._cache_pixmap(task.index, task.image))
+
+    def _render_document(self):
+        signature = (self._pdf, self._zoom, self.continuous_mode, None if self.continuous_mode else self._page_index)
+        if signature == self._render_signature:
+            return  # scene already shows this; callers redraw highlights themselves (_restore_highlights)
+        # Layout, the first visible pages and their highlights add many scene items; repaint once
+        vp = self.viewport()
+        vp.setUpdatesEnabled(False)
+        try:
+            if self.continuous_mode:
+                self._render_all_pages()
+            else:
+                self._render_single_page()
+        finally:
+            vp.setUpdatesEnabled(True)
+        vp.update()
+        self._render_signature = signature
         self._update_page_overlay()
 
     def next_page(self):
@@ -140,11 +460,7 @@ class PDFViewer(QGraphicsView):
             self._drag_start = self.mapToScene(event.pos())
             if self._rubber_band_rect:
                 self.scene().removeItem(self._rubber_band_rect)
-            self._rubber_band_rect = QGraphicsRectItem()
-            pen = QPen(QColor(255, 215, 0))
-            pen.setStyle(Qt.PenStyle.DashLine)
-            self._rubber_band_rect.setPen(pen)
-            self.scene().addItem(self._rubber_band_rect)
+            self._rubber_band_rect = self.scene().addRect(QRectF(), self._RUBBER_BAND_PEN)
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event: QMouseEvent):
@@ -169,50 +485,88 @@ class PDFViewer(QGraphicsView):
         # Determine page index in continuous mode by y position
         page_index = self._page_index
         if self.continuous_mode and self._page_offsets:
-            top_y = rect.top()
-            # Find the page whose offset range contains top_y
-            for idx in sorted(self._page_offsets.keys()):
-                y_off = self._page_offsets[idx]
-                # Determine page height from next offset (or scene bottom)
-                next_off = self._page_offsets.get(idx + 1, y_off + 10**6)
-                if y_off <= top_y < next_off:
-                    page_index = idx
-                    break
+            idx = self._page_at_y(rect.top())
+            if idx >= 0:
+                page_index = idx
         zoom = self._zoom
         # Adjust rect relative to page origin for storage
         page_offset_y = self._page_offsets.get(page_index, 0.0) if self.continuous_mode else 0.0
-        rel_top = (rect.top() - page_offset_y) / zoom
-        rel_left = rect.left() / zoom
-        rel_bottom = (rect.bottom() - page_offset_y) / zoom
-        rel_right = rect.right() / zoom
-        pdf_rect = Rect(x1=rel_left, y1=rel_top, x2=rel_right, y2=rel_bottom)
+        left, top, right, bottom = rect.getCoords()  # one call into Qt instead of four
+        pdf_rect = Rect(x1=left / zoom, y1=(top - page_offset_y) / zoom,
+                        x2=right / zoom, y2=(bottom - page_offset_y) / zoom)
         highlight = Highlight(page_index=page_index, rects=[pdf_rect])
         self.annotation_doc.add_highlight(highlight)
         self._draw_highlight(highlight)
         self.highlightCreated.emit(highlight)
 
     def _draw_highlight(self, highlight: Highlight):
-        # In single-page mode only draw current page highlights
-        if not self.continuous_mode and highlight.page_index != self._page_index:
-            return
+        self._add_highlight_items((highlight,))
+
+    def _add_highlight_items(self, highlights):
+        """Add one scene rect per highlight rect; the caller decides when to repaint.
+
+        Plain QGraphicsScene.addRect items with a shared pen and per-color brush: a
+        QGraphicsRectItem subclass costs a Python __init__ per rect. Highlights on pages
+        that are not shown are skipped; continuous mode draws a page's highlights from
+        the annotation document when the page comes within the render margin.
+        """
         zoom = self._zoom
-        y_offset = self._page_offsets.get(highlight.page_index, 0.0) if self.continuous_mode else 0.0
-        for r in highlight.rects:
-            x1, y1, x2, y2 = r.normalize().to_tuple()
-            rect = QRectF(x1*zoom, y1*zoom + y_offset, (x2-x1)*zoom, (y2-y1)*zoom)
-            item = HighlightGraphicsRect(rect, QColor(*highlight.color))
-            self.scene().addItem(item)
+        continuous = self.continuous_mode
+        page_index = self._page_index
+        offsets = self._page_offsets
+        shown = self._rendered_pages
+        add_rect = self.scene().addRect
+        pen = self._HIGHLIGHT_PEN
+        brushes = self._HIGHLIGHT_BRUSHES
+        by_page = self._hl_items_by_page
+        for hl in highlights:
+            if continuous:
+                if hl.page_index not in shown:
+                    continue
+                y_offset = offsets.get(hl.page_index, 0.0)
+            elif hl.page_index != page_index:
+                continue  # single-page mode only draws the current page
+            else:
+                y_offset = 0.0
+            key = tuple(hl.color)
+            brush = brushes.get(key)
+            if brush is None:
+                brush = brushes[key] = QBrush(QColor(*key), Qt.BrushStyle.SolidPattern)
+            items = by_page.get(hl.page_index)
+            if items is None:
+                items = by_page[hl.page_index] = []
+            for r in hl.rects:
+                x1, y1, x2, y2 = r.to_tuple()  # to_tuple() is already normalized
+                item = add_rect(x1*zoom, y1*zoom + y_offset, (x2-x1)*zoom, (y2-y1)*zoom, pen, brush)
+                item.setOpacity(0.35)
+                items.append(item)
+
+    def draw_highlights(self, highlights: List[Highlight]):
+        """Draw many highlights with a single viewport repaint."""
+        vp = self.viewport()
+        vp.setUpdatesEnabled(False)
+        try:
+            self._add_highlight_items(highlights)
+        finally:
+            vp.setUpdatesEnabled(True)
+        vp.update()
 
     def _restore_highlights(self):
+        """Redraw the highlights of every page currently shown."""
         if not self.annotation_doc:
             return
-        for hl in self.annotation_doc.highlights:
-            self._draw_highlight(hl)
+        if self._hl_items_by_page:
+            self.clear_highlight_items()
+        doc = self.annotation_doc
+        pages = self._rendered_pages if self.continuous_mode else (self._page_index,)
+        self.draw_highlights([hl for idx in sorted(pages) for hl in doc.highlights_on_page(idx)])
 
     def scroll_to_page(self, page_index: int):
         if not self._pdf:
             return
         if 0 <= page_index < self._pdf.page_count():
+            if page_index == self._page_index and not self.continuous_mode:
+                return  # already showing it; don't re-rasterize
             self._page_index = page_index
             if self.continuous_mode:
                 self.centerOn(0, self._page_offsets.get(page_index, 0) + 10)
@@ -221,18 +575,34 @@ class PDFViewer(QGraphicsView):
                 self._render_single_page(); self._restore_highlights()
             self._update_page_overlay()
 
+    def center_on_if_hidden(self, x: float, y: float):
+        """centerOn(x, y) unless that scene point is already inside the viewport."""
+        if self.viewport().rect().contains(self.mapFromScene(QPointF(x, y))):
+            return
+        self.centerOn(x, y)
+
     def clear_highlight_items(self):
         scene = self.scene()
-        for item in list(scene.items()):
-            if isinstance(item, HighlightGraphicsRect):
-                scene.removeItem(item)
+        vp = self.viewport()
+        vp.setUpdatesEnabled(False)
+        try:
+            for items in self._hl_items_by_page.values():
+                for item in items:
+                    scene.removeItem(item)
+        finally:
+            vp.setUpdatesEnabled(True)
+        self._hl_items_by_page.clear()
+        vp.update()
 
     def wheelEvent(self, event):  # noqa: N802
         if not self._pdf:
             return super().wheelEvent(event)
-        super().wheelEvent(event)
         if self.continuous_mode:
-            self._update_visible_page()
+            self._fast_scroll = True
+            self._scroll_settle_timer.start()
+        super().wheelEvent(event)
+        if self.continuous_mode and not self._visible_page_timer.isActive():
+            self._visible_page_timer.start()
         # Overlay position does not depend on scroll offset (anchored), but ensure visibility
         self._update_page_overlay()
 
@@ -243,23 +613,22 @@ class PDFViewer(QGraphicsView):
         vr = self.viewport().rect()
         center_scene = self.mapToScene(vr.center())
         y = center_scene.y()
-        # Find page whose offset range contains y
-        current = self._page_index
-        sorted_offsets = sorted(self._page_offsets.items())
-        for idx, off in sorted_offsets:
-            next_off = self._page_offsets.get(idx + 1, float('inf'))
-            if off <= y < next_off:
-                if idx != current:
-                    self._page_index = idx
-                    self.pageChanged.emit(self._page_index)
-                    self._update_page_overlay()
-                break
+        i = self._page_at_y(y)
+        if i >= 0 and i != self._page_index:
+            self._page_index = i
+            self.pageChanged.emit(self._page_index)  # _on_page_changed refreshes the overlay
+
+    def _page_at_y(self, y: float) -> int:
+        """Continuous mode: index of the page whose slot (top to next page's top) contains y; -1 above page 0."""
+        return bisect_right(self._page_tops, y) - 1
+
     # ---- Page overlay helpers ----
     def _on_page_changed(self, _idx: int):  # slot for pageChanged
         self._update_page_overlay()
 
     def resizeEvent(self, event):  # noqa: N802
         super().resizeEvent(event)
+        self._render_visible_pages()
         # Reposition overlay on resize
         self._update_page_overlay()
 
@@ -0,0 +1,50 @@
+from readingcopilot.core.annotations import AnnotationDocument, Highlight, Rect
+
+
+def _hl(page_index, note=None):
+    return Highlight(page_index=page_index, rects=[Rect(x1=0, y1=0, x2=10, y2=10)], note=note)
+
+
+def test_journal_replayed_on_load(tmp_path):
+    pdf_path = str(tmp_path / "sample.pdf")
+    doc = AnnotationDocument(pdf_path=pdf_path)
+    base = _hl(0, note="base")
+    doc.add_highlight(base)
+    doc.save()
+
+    batch = [_hl(1), _hl(2)]
+    doc.add_highlights(batch)
+    doc.append_to_journal(batch)
+    assert (tmp_path / "sample.pdf.annotations.jsonl").exists()
+
+    loaded = AnnotationDocument.load(pdf_path)
+    assert [hl.id for hl in loaded.highlights] == [base.id] + [hl.id for hl in batch]
+    assert loaded.highlights_on_page(2)[0].id == batch[1].id
+
+
+def test_journal_without_full_file_and_torn_line(tmp_path):
+    pdf_path = str(tmp_path / "sample.pdf")
+    doc = AnnotationDocument(pdf_path=pdf_path)
+    first = _hl(3)
+    doc.append_to_journal([first])
+    with open(tmp_path / "sample.pdf.annotations.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"id": "torn", "page_in')  # interrupted append
+
+    loaded = AnnotationDocument.load(pdf_path)
+    assert [hl.id for hl in loaded.highlights] == [first.id]
+
+
+def test_full_save_wins_and_discards_journal(tmp_path):
+    pdf_path = str(tmp_path / "sample.pdf")
+    doc = AnnotationDocument(pdf_path=pdf_path)
+    hl = _hl(0)
+    doc.add_highlight(hl)
+    doc.append_to_journal([hl])
+    hl.note = "edited later"
+    doc.save()
+    assert not (tmp_path / "sample.pdf.annotations.jsonl").exists()
+
+    doc.append_to_journal([hl])  # e.g. journaled again before a crash
+    loaded = AnnotationDocument.load(pdf_path)
+    assert len(loaded.highlights) == 1
+    assert loaded.highlights[0].note == "edited later"
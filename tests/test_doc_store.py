@@ -0,0 +1,103 @@
+import pytest
+
+from backend.app.models import AnnotationDocument, Highlight, Rect
+from backend.app.storage import DocStore, _STORAGE_LOCK
+from readingcopilot.core import jsonio
+
+
+def _hl(page_index):
+    return Highlight(page_index=page_index, rects=[Rect(x1=0, y1=0, x2=10, y2=10)])
+
+
+def test_bad_wal_records_are_skipped(tmp_path):
+    doc = AnnotationDocument(id="d1", filename="a.pdf", pdf_path="a.pdf")
+    hl = _hl(2)
+    records = [
+        {"op": "put", "doc": doc.model_dump(mode="json")},
+        {"op": "put", "doc": {"id": "broken"}},  # fails validation
+        {"op": "append_highlights", "version": 2, "items": []},  # no doc_id
+        {"op": "append_highlights", "doc_id": "d1", "version": 2, "items": [{"rects": []}]},
+        {"op": "append_highlights", "doc_id": "d1", "version": 3, "items": [hl.model_dump(mode="json")]},
+    ]
+    with open(tmp_path / "wal.jsonl", "wb") as f:
+        for rec in records:
+            f.write(jsonio.dumps(rec) + b"\n")
+        f.write(b'{"op":"put","doc":{"id"')  # torn final line
+
+    store = DocStore(str(tmp_path))
+    try:
+        loaded = store.get("d1")
+        assert [d.id for d in store.list()] == ["d1"]
+        assert [h.id for h in loaded.highlights] == [hl.id]
+        assert loaded.version == 3
+    finally:
+        store.close()
+
+
+def test_highlight_marks_are_bounded(tmp_path):
+    store = DocStore(str(tmp_path))
+    try:
+        doc = AnnotationDocument(filename="a.pdf", pdf_path="a.pdf")
+        store.add_document(doc)
+        for i in range(100):
+            store.append_highlights(doc.id, [_hl(i)])
+        current = store.get(doc.id)
+        assert len(store._hl_marks[doc.id]) == 64
+        new, full = store.highlights_since(current, current.version - 2)
+        assert not full and [h.page_index for h in new] == [98, 99]
+        new, full = store.highlights_since(current, doc.version)  # older than any kept mark
+        assert full and len(new) == 100
+    finally:
+        store.close()
+
+
+def test_snapshot_with_stale_wal_is_not_replayed_twice(tmp_path):
+    # A crash after index.json was replaced but before the WAL was truncated
+    store = DocStore(str(tmp_path))
+    doc = AnnotationDocument(filename="a.pdf", pdf_path="a.pdf")
+    store.add_document(doc)
+    with _STORAGE_LOCK:
+        store._persist_index()
+    store.append_highlights(doc.id, [_hl(0)])
+    stale_wal = (tmp_path / "wal.jsonl").read_bytes()  # just the append record
+    with _STORAGE_LOCK:
+        store._persist_index()
+    store.close()
+    (tmp_path / "wal.jsonl").write_bytes(stale_wal)
+
+    reloaded = DocStore(str(tmp_path))
+    try:
+        loaded = reloaded.get(doc.id)
+        assert len(loaded.highlights) == 1
+        assert loaded.version == 2
+    finally:
+        reloaded.close()
+
+
+def test_second_process_on_same_directory_is_rejected(tmp_path):
+    store = DocStore(str(tmp_path))
+    try:
+        with pytest.raises(RuntimeError):
+            DocStore(str(tmp_path))  # a separate open file description, like another worker
+    finally:
+        store.close()
+    DocStore(str(tmp_path)).close()  # released on close
+
+
+def test_mutate_leaves_published_version_untouched(tmp_path):
+    store = DocStore(str(tmp_path))
+    try:
+        doc = AnnotationDocument(filename="a.pdf", pdf_path="a.pdf")
+        store.add_document(doc)
+        before = store.append_highlights(doc.id, [_hl(0)])
+
+        def edit_in_place(d):
+            d.highlights[0].note = "edited"
+
+        with pytest.raises(ValueError):  # Highlight is frozen
+            store.mutate(doc.id, edit_in_place)
+        after = store.mutate(doc.id, lambda d: d.highlights.clear())
+        assert store.get(doc.id) is after and after.version == before.version + 1
+        assert len(before.highlights) == 1 and before.highlights[0].note is None
+    finally:
+        store.close()
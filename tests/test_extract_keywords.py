@@ -15,4 +15,11 @@ def test_extract_keywords_fallback():
     assert len(kws) <= 4
     # With no valid tokens we fall back to first tokens capitalized (may be empty if regex filters all)
     # Ensure function still returns a list (possibly empty) and doesn't raise.
-    assert isinstance(kws, list)
\ No newline at end of file
+    assert isinstance(kws, list)
+
+
+def test_extract_keywords_returns_independent_lists():
+    text = "Hyperscaler GPU demand keeps growing as hyperscaler capex rises."
+    first = extract_keywords(text, max_keywords=3)
+    first.append("Mutated")
+    assert extract_keywords(text, max_keywords=3) == first[:-1]
@@ -0,0 +1,36 @@
+from readingcopilot.core.annotations import AnnotationDocument, Highlight, Rect
+
+
+def _hl(page_index):
+    return Highlight(page_index=page_index, rects=[Rect(x1=0, y1=0, x2=10, y2=10)])
+
+
+def test_highlights_on_page_tracks_adds_and_clear(tmp_path):
+    doc = AnnotationDocument(pdf_path=str(tmp_path / "sample.pdf"))
+    a, b = _hl(0), _hl(2)
+    doc.add_highlight(a)
+    assert doc.highlights_on_page(0) == [a]
+    doc.add_highlight(b)
+    c, d = _hl(0), _hl(1)
+    doc.add_highlights([c, d])
+    assert doc.highlights_on_page(0) == [a, c]
+    assert doc.highlights_on_page(1) == [d]
+    assert doc.highlights_on_page(2) == [b]
+    assert doc.highlights_on_page(5) == []
+
+    doc.clear_highlights()
+    assert doc.highlights_on_page(0) == []
+    doc.add_highlight(b)
+    assert doc.highlights_on_page(2) == [b]
+
+
+def test_highlights_on_page_rebuilds_after_list_replaced(tmp_path):
+    doc = AnnotationDocument(pdf_path=str(tmp_path / "sample.pdf"))
+    a, b = _hl(1), _hl(0)
+    doc.add_highlights([a, b])
+    assert doc.highlights_on_page(1) == [a]
+    # e.g. the annotation panel re-sorting by page, or an external append
+    doc.highlights = sorted(doc.highlights, key=lambda hl: hl.page_index)
+    doc.highlights.append(_hl(1))
+    assert doc.highlights_on_page(1) == [a, doc.highlights[-1]]
+    assert doc.highlights_on_page(0) == [b]
@@ -0,0 +1,25 @@
+from readingcopilot.core.llm_highlight import LLMHighlighter
+from readingcopilot.core.llm_client import BaseLLMClient, ScoredChunk
+from readingcopilot.core.annotations import AnnotationDocument
+from readingcopilot.core.text_extraction import TextChunk
+
+class _CountingClient(BaseLLMClient):
+    def __init__(self):
+        self.calls = 0
+    def score_chunks(self, *, chunks, global_profile: str, document_goal: str):
+        self.calls += 1
+        return [ScoredChunk(id=c['id'], relevance=0.9, rationale='r', phrase=None) for c in chunks]
+
+def test_generate_stops_between_batches(monkeypatch, tmp_path):
+    import readingcopilot.core.llm_highlight as hl_mod
+    chunks = [TextChunk(id=i, page_index=i, text=f'chunk {i} text', rects=[(0,0,10,10)], char_count=12) for i in range(10)]
+    monkeypatch.setattr(hl_mod, 'extract_chunks', lambda path: chunks)
+    monkeypatch.setenv('RC_LLM_ROWS_PER_CALL', '2')
+    monkeypatch.setenv('RC_LLM_CONCURRENCY', '1')
+    monkeypatch.setenv('RC_LOG_LEVEL', 'off')
+    doc = AnnotationDocument(pdf_path=str(tmp_path / 'dummy.pdf'), global_profile='x', document_goal='y')
+    client = _CountingClient()
+    selected = LLMHighlighter(client).generate(doc, doc.pdf_path, density_target=0.5, should_stop=lambda: client.calls >= 2)
+    assert client.calls == 2
+    # Selection still uses the chunks scored before the stop
+    assert selected and all(h.page_index < 4 for h in selected)
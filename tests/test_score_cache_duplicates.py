@@ -0,0 +1,27 @@
+from readingcopilot.core.llm_highlight import LLMHighlighter
+from readingcopilot.core.llm_client import BaseLLMClient, ScoredChunk
+from readingcopilot.core.annotations import AnnotationDocument
+from readingcopilot.core.score_cache import ScoreCache
+from readingcopilot.core.text_extraction import TextChunk
+
+class _CountingClient(BaseLLMClient):
+    def __init__(self):
+        self.calls = 0
+    def score_chunks(self, *, chunks, global_profile: str, document_goal: str):
+        self.calls += 1
+        return [ScoredChunk(id=c['id'], relevance=0.9, rationale='r', phrase=None) for c in chunks]
+
+def test_repeated_chunk_text_is_served_from_cache(monkeypatch, tmp_path):
+    import readingcopilot.core.llm_highlight as hl_mod
+    # Same text on several pages (e.g. a speaker name) shares one cache key
+    chunks = [TextChunk(id=i, page_index=i, text='ROMEO', rects=[(0,0,10,10)], char_count=5) for i in range(3)]
+    monkeypatch.setattr(hl_mod, 'extract_chunks', lambda path: chunks)
+    monkeypatch.setenv('RC_LOG_LEVEL', 'off')
+    doc = AnnotationDocument(pdf_path=str(tmp_path / 'dummy.pdf'), global_profile='x', document_goal='y')
+    client = _CountingClient()
+    highlighter = LLMHighlighter(client, score_cache=ScoreCache(str(tmp_path / 'scores.sqlite3')))
+    highlighter.generate(doc, doc.pdf_path, density_target=0.5)
+    calls = client.calls
+    selected = highlighter.generate(doc, doc.pdf_path, density_target=0.5)
+    assert client.calls == calls
+    assert selected
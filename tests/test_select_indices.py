@@ -0,0 +1,15 @@
+from readingcopilot.core.llm_highlight import select_indices
+
+
+def test_select_indices_orders_by_relevance_and_respects_threshold():
+    rels = [0.7, 0.95, 0.4, 0.95, 0.8]
+    words = [10, 10, 10, 10, 10]
+    # Ties keep chunk order; below-threshold chunk (0.4) is never picked
+    assert select_indices(rels, words, min_threshold=0.6, target_words=100) == [1, 3, 4, 0]
+
+
+def test_select_indices_stops_at_soft_cap():
+    rels = [0.9, 0.8, 0.7, 0.65]
+    words = [30, 30, 30, 30]
+    # target 25 words * 2.0 soft cap = 50 -> stops after the second chunk
+    assert select_indices(rels, words, min_threshold=0.6, target_words=25) == [0, 1]